@@ -2,37 +2,55 @@
 import os
 import sys
 import asyncio
-import time
-import threading
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, MemoryHandler
 from pathlib import Path
 from typing import Optional
 
 # Define log format with clear, structured messages
 log_format = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
 
-# Create logs directory if it doesn't exist
+# Create data directories if they don't exist - only the leaves are
+# listed, parents (/data, /data/cache) are created along the way
 log_dir = os.path.join('/data', 'logs')
-os.makedirs(log_dir, exist_ok=True)
+for directory in (log_dir, '/data/cache/tmp'):
+    Path(directory).mkdir(parents=True, exist_ok=True)
 
 # Setup handlers
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(logging.Formatter(log_format))
 
+class _FastRFH(RotatingFileHandler):
+    """RotatingFileHandler that checks the size without formatting each record twice"""
+    
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        return self.maxBytes > 0 and self.stream.tell() >= self.maxBytes
+
 # Rotating file handler - keeps logs manageable
-file_handler = RotatingFileHandler(
+file_handler = _FastRFH(
     os.path.join(log_dir, 'hertz.log'),
     maxBytes=10*1024*1024,  # 10MB
     backupCount=5  # Keep 5 backup logs
 )
 file_handler.setFormatter(logging.Formatter(log_format))
 
+# Buffer file writes - flushed every 512 records or immediately on errors
+buffered_file_handler = MemoryHandler(
+    capacity=512,
+    flushLevel=logging.ERROR,
+    target=file_handler,
+    flushOnClose=True
+)
+atexit.register(buffered_file_handler.flush)
+
 # Configure root logger
 root_logger = logging.getLogger()
 root_logger.setLevel(logging.INFO)  # Default level
 root_logger.addHandler(console_handler)
-root_logger.addHandler(file_handler)
+root_logger.addHandler(buffered_file_handler)
 
 # Adjust levels for specific modules
 logging.getLogger('disnake').setLevel(logging.WARNING)
@@ -49,35 +67,8 @@ logging.getLogger('hertz.db.client').setLevel(logging.INFO)  # Database operatio
 
 logger = logging.getLogger(__name__)
 
-# Create data directories if they don't exist
-os.makedirs('/data', exist_ok=True)
-os.makedirs('/data/cache', exist_ok=True)
-os.makedirs('/data/cache/tmp', exist_ok=True)
-
-# Health check file writer function
-def health_file_writer():
-    """Thread that periodically writes to a health check file"""
-    health_file = '/data/health_status'
-    health_logger = logging.getLogger('hertz.health')
-    health_logger.info(f"Health check writer started, writing to {health_file}")
-    while True:
-        try:
-            # Create health status file
-            with open(health_file, 'w') as f:
-                f.write(str(int(time.time())))
-            time.sleep(10)  # Update every 10 seconds
-        except Exception as e:
-            health_logger.error(f"Health check write failed: {e}")
-            time.sleep(1)  # Short delay on error
-
-# Start health check thread
-health_thread = threading.Thread(target=health_file_writer, daemon=True)
-health_thread.start()
-
 # ASCII Banner Display
-def display_banner():
-    """Display the HERTZ startup banner"""
-    banner = """
+_BANNER = """
     ╭─────────────────────────────────────────────╮
     │                                             │
     │      ██╗  ██╗███████╗██████╗ ████████╗███████╗    │
@@ -90,8 +81,18 @@ def display_banner():
     │           Discord Music Bot v1.0.1          │
     │                                             │
     ╰─────────────────────────────────────────────╯
-    """
-    print(banner)
+"""
+
+# Use orjson for gateway JSON if available - newer disnake picks it up on its own
+try:
+    import orjson
+    import disnake.utils
+    
+    if not getattr(disnake.utils, "HAS_ORJSON", False):
+        disnake.utils._to_json = lambda obj: orjson.dumps(obj).decode("utf-8")
+        disnake.utils._from_json = orjson.loads
+except ImportError:
+    pass
 
 try:
     from hertz.bot import HertzBot
@@ -114,7 +115,16 @@ try:
             sys.exit(1)
         
         # Display startup banner
-        display_banner()
+        sys.stdout.write(_BANNER)
+        sys.stdout.flush()
+        
+        # Use uvloop for faster event loop if available
+        try:
+            import uvloop
+            uvloop.install()
+            logger.info("uvloop enabled")
+        except ImportError:
+            pass
         
         # Create and run the bot
         bot = HertzBot(config)
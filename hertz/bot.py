@@ -1,8 +1,10 @@
 # hertz/bot.py
-import os
 import asyncio
+import importlib
 import logging
 import sys
+import traceback
+from pathlib import Path
 from typing import Dict, Optional, List
 
 import disnake
@@ -10,11 +12,77 @@ from disnake.ext import commands
 
 from .config import Config
 from .services.player_manager import PlayerManager
+from .services.player import Status
 from .services.file_cache import FileCacheProvider
-from .db.client import initialize_db
+from .services.youtube import configure_request_queue
+from .utils.voice import reset_voice_counts, track_voice_state
+from .db.client import cleanup_expired_key_value_cache, initialize_db
+from . import health_writer
+from .services import http
+from .db import settings_cache
 
 logger = logging.getLogger(__name__)
 
+# Player states reconciled by the health check
+_PLAYING = Status.PLAYING
+_IDLE = Status.IDLE
+
+# Channel names to fall back on for the welcome message
+_WELCOME_NAMES = frozenset(("general", "welcome", "chat"))
+
+# Welcome embeds sent when joining a guild
+_OWNER_EMBED = disnake.Embed(
+    title="📡 HERTZ Broadcasting System - Now Online",
+    description=(
+        "**🎛️ Studio Configuration Ready**\n\n"
+        "Thank you for adding HERTZ to your server! Your audio transmission station is now online and ready for operation.\n\n"
+        "**Quick Start Guide:**\n"
+        "• Use `/play` to begin audio transmission\n"
+        "• Use `/help` to see all available controls\n"
+        "• Administrators can use `/config` to adjust broadcast parameters\n\n"
+        "By default, all server members can control HERTZ in all channels. "
+        "For professional operation, consider configuring channel-specific permissions."
+    ),
+    color=disnake.Color.blue()
+)
+
+_OWNER_EMBED.add_field(
+    name="📻 Signal Setup",
+    value="Join a voice channel and use `/play` to start your first transmission!",
+    inline=False
+)
+
+_OWNER_EMBED.add_field(
+    name="🔧 Technical Support",
+    value="If you experience signal interference, visit our support server or documentation.",
+    inline=False
+)
+
+_OWNER_EMBED.set_footer(text="HERTZ Audio Solutions - Professional Broadcasting for Discord")
+
+_CHANNEL_EMBED = disnake.Embed(
+    title="📡 HERTZ Broadcasting System - Now Online",
+    description=(
+        "**🎛️ Audio Transmission Station Ready**\n\n"
+        "Thanks for adding HERTZ to your server! Your music broadcasting system is now online.\n\n"
+        "• Use `/play` to start transmitting music\n"
+        "• Administrators can use `/config` to adjust settings\n\n"
+        "Join a voice channel to begin broadcasting!"
+    ),
+    color=disnake.Color.blue()
+)
+
+# Cog modules and the command class each one provides, in load order
+COGS = (
+    ("music", "MusicCommands"),
+    ("queue", "QueueCommands"),
+    ("playback", "PlaybackCommands"),
+    ("favorites", "FavoritesCommands"),
+    ("config", "ConfigCommands"),
+    ("cache", "CacheCommands"),
+    ("health", "HealthCommands"),
+)
+
 class HertzBot(commands.InteractionBot):
     def __init__(self, config: Config):
         intents = disnake.Intents.default()
@@ -23,9 +91,13 @@ class HertzBot(commands.InteractionBot):
         intents.guilds = True
         
         self.config = config
+        configure_request_queue(config)
         self.file_cache = FileCacheProvider(config)
         self.player_manager = PlayerManager(self.file_cache)
         self.players = self.player_manager.players  # Reference to players dictionary for health checks
+        self._cmd_names_str = ""  # Registered command names, filled in by load_cogs
+        self.cache_stats = None  # Latest file cache statistics, refreshed in the background
+        self._settings_warmed = False  # on_ready fires again on every reconnect
         
         # Use your server ID for test_guilds (faster command registration)
         test_guilds = None
@@ -34,11 +106,11 @@ class HertzBot(commands.InteractionBot):
             intents=intents,
             test_guilds=test_guilds,  # This is the key for rapid command registration
             activity=disnake.Activity(
-                type=getattr(disnake.ActivityType, config.BOT_ACTIVITY_TYPE.lower()),
+                type=config.BOT_ACTIVITY_TYPE,
                 name=config.BOT_ACTIVITY,
-                url=config.BOT_ACTIVITY_URL if config.BOT_ACTIVITY_TYPE == "STREAMING" else None
+                url=config.BOT_ACTIVITY_URL if config.BOT_ACTIVITY_TYPE == disnake.ActivityType.streaming else None
             ),
-            status=getattr(disnake.Status, config.BOT_STATUS.lower())
+            status=config.BOT_STATUS
         )
         
         # Add a test slash command directly to verify it works
@@ -50,38 +122,74 @@ class HertzBot(commands.InteractionBot):
             await inter.response.send_message("Pong!")
             
         logger.info("Added ping command directly to bot")
+        
+        # Bot-wide pre-invoke hook; cogs opt in to deferral through auto_defer
+        self.before_slash_command_invoke(self._auto_defer)
+    
+    async def _auto_defer(self, inter: disnake.ApplicationCommandInteraction):
+        """Defer commands from cogs that opt in with auto_defer, before any handler work"""
+        cog = inter.application_command.cog
+        if getattr(cog, "auto_defer", False) and not inter.response.is_done():
+            await inter.response.defer(ephemeral=getattr(cog, "auto_defer_ephemeral", False))
     
     async def start(self, *args, **kwargs):
         """Override start to initialize database and load cogs before connecting"""
+        # Start the heartbeat for the Docker health check right away so it
+        # stays fresh while the startup checks and cog loading run
+        health_writer.start()
+        
         logger.info("Starting health checks...")
         
-        # Test database connection
-        try:
-            await initialize_db()
-            logger.info("Database connection successful")
-        except Exception as e:
-            logger.critical(f"Database connection failed: {e}")
-            sys.exit(1)
-            
-        # Test YouTube API
-        try:
-            from .services.youtube import test_youtube_api
-            await test_youtube_api(self.config.YOUTUBE_API_KEY)
-            logger.info("YouTube API connection successful")
-        except Exception as e:
-            logger.error(f"YouTube API connection failed: {e}")
-            # Continue anyway, but warn
-            
+        from .services.youtube import test_youtube_api
+        
+        # Run independent startup checks concurrently
+        checks = {
+            "Database": self._init_storage(),
+            "YouTube API": test_youtube_api(self.config.YOUTUBE_API_KEY),
+        }
+        
         # Test Spotify API if configured
         if self.config.SPOTIFY_CLIENT_ID and self.config.SPOTIFY_CLIENT_SECRET:
-            try:
-                from .services.spotify import test_spotify_api
-                await test_spotify_api(self.config)
-                logger.info("Spotify API connection successful")
-            except Exception as e:
-                logger.error(f"Spotify API connection failed: {e}")
+            from .services.spotify import test_spotify_api
+            checks["Spotify API"] = test_spotify_api(self.config)
+        
+        results = await asyncio.gather(*checks.values(), return_exceptions=True)
+        
+        for name, result in zip(checks, results):
+            if not isinstance(result, BaseException):
+                logger.info(f"{name} connection successful")
+            elif name == "Database":
+                logger.critical(f"{name} connection failed: {result}")
+                sys.exit(1)
+            else:
                 # Continue anyway, but warn
-                
+                logger.error(f"{name} connection failed: {result}")
+        
+        # Keep cache statistics warm for /cache and the dashboard
+        asyncio.create_task(self._refresh_cache_stats())
+        
+        # Drop expired key-value cache rows in the background
+        asyncio.create_task(self._sweep_key_value_cache())
+        
+        # Load cogs before connecting
+        await self.load_cogs()
+        
+        # Start periodic health check task
+        self.start_health_check_task()
+        
+        # Continue with normal startup
+        await super().start(*args, **kwargs)
+    
+    async def close(self):
+        """Release shared resources before disconnecting"""
+        health_writer.stop()
+        await http.close_session()
+        await super().close()
+    
+    async def _init_storage(self):
+        """Initialize the database, then clean up the file cache that depends on it"""
+        await initialize_db()
+        
         # Test cache directories
         try:
             await self.file_cache.cleanup()
@@ -90,95 +198,90 @@ class HertzBot(commands.InteractionBot):
             logger.error(f"File cache initialization failed: {e}")
             # Try to create directories again
             try:
-                os.makedirs(self.config.CACHE_DIR, exist_ok=True)
-                os.makedirs(os.path.join(self.config.CACHE_DIR, 'tmp'), exist_ok=True)
+                Path(self.config.CACHE_DIR, 'tmp').mkdir(parents=True, exist_ok=True)
             except Exception:
                 pass
-        
-        # Load cogs before connecting
-        await self.load_cogs()
-        
-        # Start periodic health check task
-        self.start_health_check_task()
-        
-        # Continue with normal startup
-        await super().start(*args, **kwargs)
+    
+    async def _refresh_cache_stats(self):
+        """Periodically snapshot file cache statistics"""
+        while True:
+            try:
+                self.cache_stats = await self.file_cache.get_stats()
+            except Exception as e:
+                logger.error(f"Error refreshing cache stats: {e}")
+            
+            await asyncio.sleep(30)
+    
+    async def _sweep_key_value_cache(self):
+        """Periodically delete expired key-value cache rows"""
+        while True:
+            await asyncio.sleep(60)
+            
+            try:
+                removed = await cleanup_expired_key_value_cache()
+                if removed:
+                    logger.debug(f"Removed {removed} expired key-value cache entries")
+            except Exception as e:
+                logger.error(f"Error sweeping key-value cache: {e}")
     
     def start_health_check_task(self):
         """Start a periodic task to check bot health"""
-        async def health_check():
-            while True:
-                try:
-                    # Check bot connection
-                    if not self.is_ready():
-                        logger.warning("Bot is not connected, awaiting reconnect")
-                        # Let the automatic reconnect handle it
-                    
-                    # Check voice connections
-                    for guild_id, player in self.player_manager.players.items():
-                        if player.voice_client and player.voice_client.is_connected():
-                            # Check if voice client is playing but status is not PLAYING
-                            if player.voice_client.is_playing() and player.status != player.Status.PLAYING:
-                                logger.warning(f"Voice client state mismatch in guild {guild_id}, fixing")
-                                player.status = player.Status.PLAYING
-                            # Check if voice client is not playing but status is PLAYING
-                            elif not player.voice_client.is_playing() and player.status == player.Status.PLAYING:
-                                logger.warning(f"Voice client state mismatch in guild {guild_id}, fixing")
-                                player.status = player.Status.IDLE
-                    
-                    # Update the health status file
-                    with open('/data/health_status', 'w') as f:
-                        import time
-                        f.write(str(int(time.time())))
-                    
-                    # Wait for next check
-                    await asyncio.sleep(60)  # Check every minute
-                except Exception as e:
-                    logger.error(f"Error in health check: {e}")
-                    await asyncio.sleep(10)  # Wait a bit before retrying
+        asyncio.get_event_loop().call_soon(self._health_tick)
+    
+    def _health_tick(self):
+        """Run one health check and reschedule the next one"""
+        try:
+            self._do_health_check()
+            delay = 60  # Check every minute
+        except Exception as e:
+            logger.error(f"Error in health check: {e}")
+            delay = 10  # Wait a bit before retrying
+        
+        asyncio.get_event_loop().call_later(delay, self._health_tick)
+    
+    def _do_health_check(self):
+        """Check the gateway connection and reconcile voice client state"""
+        # Check bot connection
+        if not self.is_ready():
+            logger.warning("Bot is not connected, awaiting reconnect")
+            # Let the automatic reconnect handle it
         
-        # Start the health check task
-        asyncio.create_task(health_check())
+        # Check voice connections
+        for player in self.player_manager.players.values():
+            voice_client = player.voice_client
+            if not voice_client or not voice_client.is_connected():
+                continue
+            
+            is_playing = voice_client.is_playing()
+            is_status_playing = player.status is _PLAYING
+            
+            # Voice client is playing but status is not PLAYING, or the other way round
+            if is_playing != is_status_playing:
+                logger.warning(f"Voice client state mismatch in guild {player.guild_id}, fixing")
+                player.status = _PLAYING if is_playing else _IDLE
     
     async def load_cogs(self) -> None:
         """Load all cogs"""
         try:
             logger.info("Starting to load cogs...")
             
-            # Import cog modules
-            from .cogs import music, queue, playback, favorites, config, cache, health
-            
-            # Add cogs with detailed logging
-            self.add_cog(music.MusicCommands(self))
-            logger.info("Added music commands cog")
-            
-            self.add_cog(queue.QueueCommands(self))
-            logger.info("Added queue commands cog")
-            
-            self.add_cog(playback.PlaybackCommands(self))
-            logger.info("Added playback commands cog")
-            
-            self.add_cog(favorites.FavoritesCommands(self))
-            logger.info("Added favorites commands cog")
-            
-            self.add_cog(config.ConfigCommands(self))
-            logger.info("Added config commands cog")
-            
-            self.add_cog(cache.CacheCommands(self))
-            logger.info("Added cache commands cog")
+            # Import cog modules concurrently, off the event loop
+            modules = await asyncio.gather(*(
+                asyncio.to_thread(importlib.import_module, f".cogs.{name}", package=__package__)
+                for name, _ in COGS
+            ))
             
-            self.add_cog(health.HealthCommands(self))
-            logger.info("Added health commands cog")
+            # Add cogs in a stable order with detailed logging
+            for (name, class_name), module in zip(COGS, modules):
+                self.add_cog(getattr(module, class_name)(self))
+                logger.info(f"Added {name} commands cog")
             
             # Log registered commands
-            all_commands = []
-            for cmd in self.application_commands:
-                all_commands.append(cmd.name)
-            logger.info(f"Registered commands: {', '.join(all_commands)}")
+            self._cmd_names_str = ', '.join(cmd.name for cmd in self.application_commands)
+            logger.info(f"Registered commands: {self._cmd_names_str}")
             
         except Exception as e:
             logger.error(f"Error loading cogs: {e}")
-            import traceback
             logger.error(traceback.format_exc())
     
     async def on_ready(self):
@@ -187,10 +290,16 @@ class HertzBot(commands.InteractionBot):
         logger.info(f"Connected to {len(self.guilds)} guilds")
         
         # Print all available commands
-        all_commands = []
-        for cmd in self.application_commands:
-            all_commands.append(cmd.name)
-        logger.info(f"Commands available: {', '.join(all_commands)}")
+        logger.info(f"Commands available: {self._cmd_names_str}")
+        
+        # Voice events may have been missed while disconnected, recount on demand
+        reset_voice_counts()
+        
+        # Preload guild settings in the background so the first /config hits memory;
+        # only once, later guilds are loaded on first use or on_guild_join
+        if not self._settings_warmed:
+            self._settings_warmed = True
+            asyncio.create_task(settings_cache.warm(str(guild.id) for guild in self.guilds))
         
         logger.info(f"Invite URL: https://discord.com/oauth2/authorize?client_id={self.user.id}&scope=bot%20applications.commands&permissions=277062449216")
     
@@ -205,7 +314,7 @@ class HertzBot(commands.InteractionBot):
             logger.info(f"Created settings for guild: {guild.name}")
             
             # Find a suitable channel for welcoming if we can't reach the owner
-            welcome_channel = guild.system_channel or next((c for c in guild.text_channels if c.name.lower() in ["general", "welcome", "chat"]), None)
+            welcome_channel = guild.system_channel or next((c for c in guild.text_channels if c.name.lower() in _WELCOME_NAMES), None)
             
             # Attempt to explicitly fetch the guild owner
             guild_owner = None
@@ -224,53 +333,11 @@ class HertzBot(commands.InteractionBot):
             except Exception as owner_error:
                 logger.error(f"Error fetching guild owner: {str(owner_error)}")
             
-            # Prepare the welcome embeds
-            owner_embed = disnake.Embed(
-                title="📡 HERTZ Broadcasting System - Now Online",
-                description=(
-                    "**🎛️ Studio Configuration Ready**\n\n"
-                    "Thank you for adding HERTZ to your server! Your audio transmission station is now online and ready for operation.\n\n"
-                    "**Quick Start Guide:**\n"
-                    "• Use `/play` to begin audio transmission\n"
-                    "• Use `/help` to see all available controls\n"
-                    "• Administrators can use `/config` to adjust broadcast parameters\n\n"
-                    "By default, all server members can control HERTZ in all channels. "
-                    "For professional operation, consider configuring channel-specific permissions."
-                ),
-                color=disnake.Color.blue()
-            )
-            
-            owner_embed.add_field(
-                name="📻 Signal Setup",
-                value="Join a voice channel and use `/play` to start your first transmission!",
-                inline=False
-            )
-            
-            owner_embed.add_field(
-                name="🔧 Technical Support",
-                value="If you experience signal interference, visit our support server or documentation.",
-                inline=False
-            )
-            
-            owner_embed.set_footer(text="HERTZ Audio Solutions - Professional Broadcasting for Discord")
-            
-            channel_embed = disnake.Embed(
-                title="📡 HERTZ Broadcasting System - Now Online",
-                description=(
-                    "**🎛️ Audio Transmission Station Ready**\n\n"
-                    "Thanks for adding HERTZ to your server! Your music broadcasting system is now online.\n\n"
-                    "• Use `/play` to start transmitting music\n"
-                    "• Administrators can use `/config` to adjust settings\n\n"
-                    "Join a voice channel to begin broadcasting!"
-                ),
-                color=disnake.Color.blue()
-            )
-            
             # Try to send welcome message to the guild owner first
             owner_dm_sent = False
             if guild_owner:
                 try:
-                    await guild_owner.send(embed=owner_embed)
+                    await guild_owner.send(embed=_OWNER_EMBED)
                     logger.info(f"Welcome message sent to owner of {guild.name}")
                     owner_dm_sent = True
                 except disnake.Forbidden as e:
@@ -284,7 +351,7 @@ class HertzBot(commands.InteractionBot):
             if not owner_dm_sent and welcome_channel and welcome_channel.permissions_for(guild.me).send_messages:
                 try:
                     logger.info(f"Attempting to send welcome message to channel: {welcome_channel.name}")
-                    await welcome_channel.send(embed=channel_embed)
+                    await welcome_channel.send(embed=_CHANNEL_EMBED)
                     logger.info(f"Welcome message sent to channel {welcome_channel.name} in {guild.name}")
                 except Exception as e:
                     logger.error(f"Could not send welcome message to channel: {str(e)}")
@@ -293,19 +360,25 @@ class HertzBot(commands.InteractionBot):
             
         except Exception as e:
             logger.error(f"Error in guild join handler: {str(e)}")
-            import traceback
             logger.error(traceback.format_exc())
     
     async def on_voice_state_update(self, member: disnake.Member, before: disnake.VoiceState, after: disnake.VoiceState):
         """Handle voice state updates with improved error handling"""
+        track_voice_state(member, before, after)
+        
         # Skip bot updates
         if member.bot:
             return
         
+        # Skip guilds without an active player
+        players = self.player_manager.players
+        if member.guild.id not in players:
+            return
+        
         try:
             # Handle disconnections
             if before.channel and (not after.channel or before.channel.id != after.channel.id):
-                player = self.player_manager.get_player(member.guild.id)
+                player = players[member.guild.id]
                 
                 if not player.voice_client:
                     return
@@ -315,8 +388,8 @@ class HertzBot(commands.InteractionBot):
                     non_bot_count = sum(1 for m in before.channel.members if not m.bot)
                     
                     if non_bot_count == 0:
-                        from .db.client import get_guild_settings
-                        settings = await get_guild_settings(str(member.guild.id))
+                        from .db.settings_cache import get_guild_settings_cached
+                        settings = await get_guild_settings_cached(str(member.guild.id))
                         
                         if settings.leaveIfNoListeners:
                             logger.info(f"All users left voice channel in {member.guild.name}, disconnecting")
@@ -324,15 +397,14 @@ class HertzBot(commands.InteractionBot):
                 
             # Handle reconnection attempts for moved channels
             if after.channel and member.id == self.user.id:
-                player = self.player_manager.get_player(member.guild.id)
+                player = players[member.guild.id]
                 
                 if player.voice_client and player.voice_client.channel.id != after.channel.id:
                     logger.info(f"Bot was moved to a new channel in {member.guild.name}, reconnecting")
                     await player.connect(after.channel)
-                    if player.status in [player.Status.PLAYING, player.Status.PAUSED]:
+                    if player.status in (Status.PLAYING, Status.PAUSED):
                         await player.play()
                         
         except Exception as e:
             logger.error(f"Error in voice state update handler: {e}")
-            import traceback
             logger.error(traceback.format_exc())
\ No newline at end of file
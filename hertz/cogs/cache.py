@@ -7,7 +7,7 @@ import disnake
 from disnake import ApplicationCommandInteraction
 from disnake.ext import commands
 
-from ..utils.embeds import create_cache_embed
+from ..utils.embeds import create_cache_embed, format_cache_embed
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +23,22 @@ class CacheCommands(commands.Cog):
     )
     async def cache_info(self, inter: ApplicationCommandInteraction):
         """Display cache information"""
-        await inter.response.defer()
-        
         try:
-            # Create cache embed using the utility function - note the await!
+            # Format the background snapshot when available - no I/O needed
+            snapshot = self.bot.cache_stats
+            if snapshot is not None:
+                await inter.response.send_message(embed=format_cache_embed(self.bot, snapshot))
+                return
+            
+            await inter.response.defer()
+            
+            # No snapshot yet, create cache embed using the utility function - note the await!
             embed = await create_cache_embed(self.bot)
             await inter.followup.send(embed=embed)
             
         except Exception as e:
             logger.error(f"Error displaying cache info: {e}")
-            await inter.followup.send("Error retrieving cache information")
\ No newline at end of file
+            if inter.response.is_done():
+                await inter.followup.send("Error retrieving cache information")
+            else:
+                await inter.response.send_message("Error retrieving cache information")
\ No newline at end of file
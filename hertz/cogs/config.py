@@ -1,19 +1,91 @@
 # hertz/cogs/config.py
+import asyncio
 import logging
-from typing import Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 import disnake
 from disnake import ApplicationCommandInteraction
 from disnake.ext import commands
 
+from ..db.client import Setting
+from ..db.settings_cache import get_guild_settings_cached, update_setting
+from ..utils.error_msg import error_msg
+
 logger = logging.getLogger(__name__)
 
+_EMBED_COLOR = disnake.Color.blue()
+
+# Discord allows 3s for the initial response; past this we defer instead
+RESPONSE_DEADLINE = 2.5
+
+# (label, formatter) pairs shown by /config get, in display order
+_SETTING_ROWS: Tuple[Tuple[str, Callable[[Setting], Any]], ...] = (
+    ("Playlist Limit", lambda s: s.playlistLimit),
+    ("Wait before leaving after queue empty", lambda s: (
+        "never leave" if s.secondsToWaitAfterQueueEmpties == 0
+        else f"{s.secondsToWaitAfterQueueEmpties}s"
+    )),
+    ("Leave if there are no listeners", lambda s: "yes" if s.leaveIfNoListeners else "no"),
+    ("Auto announce next track in queue", lambda s: "yes" if s.autoAnnounceNextSong else "no"),
+    ("Add to queue responses show for requester only", lambda s: "yes" if s.queueAddResponseEphemeral else "no"),
+    ("Default Volume", lambda s: f"{s.defaultVolume}%"),
+    ("Default queue page size", lambda s: s.defaultQueuePageSize),
+    ("Reduce volume when people speak", lambda s: "yes" if s.turnDownVolumeWhenPeopleSpeak else "no"),
+    ("Volume reduction target", lambda s: f"{s.turnDownVolumeWhenPeopleSpeakTarget}%"),
+)
+
+# Acknowledgement for each setter, formatted with the new value
+_RESPONSES: Dict[str, str] = {
+    "playlistLimit": "📊 Signal calibrated: playlist limit updated",
+    "secondsToWaitAfterQueueEmpties": "⏱️ Timing protocol updated: automatic disconnect delay configured",
+    "leaveIfNoListeners": "🔌 Auto-disconnect protocol updated: empty channel behavior configured",
+    "queueAddResponseEphemeral": "📲 Notification protocol updated: queue addition visibility configured",
+    "autoAnnounceNextSong": "📣 Broadcast protocol updated: auto-announce setting configured",
+    "defaultVolume": "🔊 Audio gain calibrated: default volume set to {value}%",
+    "defaultQueuePageSize": "📋 Display parameters updated: queue page size configured",
+    "turnDownVolumeWhenPeopleSpeak": "🎤 Voice priority protocol updated: volume reduction during speech configured",
+    "turnDownVolumeWhenPeopleSpeakTarget": "🎚️ Voice priority threshold calibrated: speech volume set to {value}%",
+}
+
+def _setter(field: str, option_type: type, **param_kwargs) -> Callable:
+    """Build a /config sub-command callback that stores its option in field"""
+    async def setter(self, inter: ApplicationCommandInteraction, value=commands.Param(**param_kwargs)):
+        await self._apply_setting(inter, field, value)
+    
+    # disnake derives the option type from the annotation, so set it before decorating
+    setter.__annotations__["value"] = option_type
+    setter.__name__ = setter.__qualname__ = f"set_{field}"
+    return setter
+
 class ConfigCommands(commands.Cog):
     """Commands for configuring the bot"""
     
     def __init__(self, bot):
         self.bot = bot
     
+    async def _apply_setting(self, inter: ApplicationCommandInteraction, field: str, value: Any):
+        """Save a setting and reply in one call, deferring only if the update is slow"""
+        message = _RESPONSES[field].format(value=value)
+        task = asyncio.ensure_future(update_setting(str(inter.guild.id), field, value))
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=RESPONSE_DEADLINE)
+        except asyncio.TimeoutError:
+            await inter.response.defer(ephemeral=True)
+            try:
+                await task
+            except Exception as e:
+                logger.error("[ERROR] Error saving setting %s: %s", field, e)
+                await inter.followup.send(error_msg(str(e)), ephemeral=True)
+                return
+            await inter.followup.send(message, ephemeral=True)
+            return
+        except Exception as e:
+            logger.error("[ERROR] Error saving setting %s: %s", field, e)
+            await inter.response.send_message(error_msg(str(e)), ephemeral=True)
+            return
+        
+        await inter.response.send_message(message, ephemeral=True)
+    
     # Changed from variable assignment to decorator pattern
     @commands.slash_command(
         name="config",
@@ -33,251 +105,61 @@ class ConfigCommands(commands.Cog):
         await inter.response.defer()
         
         # Get current settings
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(inter.guild.id))
+        settings = await get_guild_settings_cached(str(inter.guild.id))
         
         # Create embed with settings
         embed = disnake.Embed(
             title="📡 HERTZ Control Panel",
             description="Current broadcast configuration parameters",
-            color=disnake.Color.blue()
+            color=_EMBED_COLOR
         )
         
-        settings_to_show = {
-            "Playlist Limit": settings.playlistLimit,
-            "Wait before leaving after queue empty": (
-                "never leave" if settings.secondsToWaitAfterQueueEmpties == 0
-                else f"{settings.secondsToWaitAfterQueueEmpties}s"
-            ),
-            "Leave if there are no listeners": "yes" if settings.leaveIfNoListeners else "no",
-            "Auto announce next track in queue": "yes" if settings.autoAnnounceNextSong else "no",
-            "Add to queue responses show for requester only": "yes" if settings.queueAddResponseEphemeral else "no",
-            "Default Volume": f"{settings.defaultVolume}%",
-            "Default queue page size": settings.defaultQueuePageSize,
-            "Reduce volume when people speak": "yes" if settings.turnDownVolumeWhenPeopleSpeak else "no",
-            "Volume reduction target": f"{settings.turnDownVolumeWhenPeopleSpeakTarget}%",
-        }
-        
         # Add all settings to the embed description
-        description = ""
-        for key, value in settings_to_show.items():
-            description += f"**{key}**: {value}\n"
-        
-        embed.description = description
+        embed.description = "\n".join(f"**{label}**: {fmt(settings)}" for label, fmt in _SETTING_ROWS)
         
         await inter.followup.send(embed=embed)
     
-    @config_group.sub_command(
+    set_playlist_limit = config_group.sub_command(
         name="set-playlist-limit",
         description="Set the maximum number of tracks from a playlist"
-    )
-    async def set_playlist_limit(
-        self,
-        inter: ApplicationCommandInteraction,
-        limit: int = commands.Param(
-            description="Maximum number of tracks (min: 1)",
-            ge=1
-        )
-    ):
-        """Set maximum tracks to add from playlists"""
-        await inter.response.defer()
-        
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(inter.guild.id))
-        
-        # Update setting
-        settings.playlistLimit = limit
-        await settings.save()
-        
-        await inter.followup.send("📊 Signal calibrated: playlist limit updated")
+    )(_setter("playlistLimit", int, name="limit", description="Maximum number of tracks (min: 1)", ge=1))
     
-    @config_group.sub_command(
+    set_wait_after_queue_empties = config_group.sub_command(
         name="set-wait-after-queue-empties",
         description="Set the time to wait before leaving when queue empties"
-    )
-    async def set_wait_after_queue_empties(
-        self,
-        inter: ApplicationCommandInteraction,
-        delay: int = commands.Param(
-            description="Delay in seconds (0 = never leave)",
-            ge=0
-        )
-    ):
-        """Set wait time before disconnecting when queue is empty"""
-        await inter.response.defer()
-        
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(inter.guild.id))
-        
-        # Update setting
-        settings.secondsToWaitAfterQueueEmpties = delay
-        await settings.save()
-        
-        await inter.followup.send("⏱️ Timing protocol updated: automatic disconnect delay configured")
+    )(_setter("secondsToWaitAfterQueueEmpties", int, name="delay", description="Delay in seconds (0 = never leave)", ge=0))
     
-    @config_group.sub_command(
+    set_leave_if_no_listeners = config_group.sub_command(
         name="set-leave-if-no-listeners",
         description="Set whether to leave when all other participants leave"
-    )
-    async def set_leave_if_no_listeners(
-        self,
-        inter: ApplicationCommandInteraction,
-        value: bool = commands.Param(
-            description="Whether to leave when everyone else leaves"
-        )
-    ):
-        """Set whether to leave when all users leave the channel"""
-        await inter.response.defer()
-        
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(inter.guild.id))
-        
-        # Update setting
-        settings.leaveIfNoListeners = value
-        await settings.save()
-        
-        await inter.followup.send("🔌 Auto-disconnect protocol updated: empty channel behavior configured")
+    )(_setter("leaveIfNoListeners", bool, name="value", description="Whether to leave when everyone else leaves"))
     
-    @config_group.sub_command(
+    set_queue_add_response_hidden = config_group.sub_command(
         name="set-queue-add-response-hidden",
         description="Set whether bot responses to queue additions are only for requester"
-    )
-    async def set_queue_add_response_hidden(
-        self,
-        inter: ApplicationCommandInteraction,
-        value: bool = commands.Param(
-            description="Whether responses should be ephemeral (only visible to requester)"
-        )
-    ):
-        """Set whether queue add responses are only visible to requester"""
-        await inter.response.defer()
-        
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(inter.guild.id))
-        
-        # Update setting
-        settings.queueAddResponseEphemeral = value
-        await settings.save()
-        
-        await inter.followup.send("📲 Notification protocol updated: queue addition visibility configured")
+    )(_setter("queueAddResponseEphemeral", bool, name="value", description="Whether responses should be ephemeral (only visible to requester)"))
     
-    @config_group.sub_command(
+    set_auto_announce_next_song = config_group.sub_command(
         name="set-auto-announce-next-song",
         description="Set whether to announce next song automatically"
-    )
-    async def set_auto_announce_next_song(
-        self,
-        inter: ApplicationCommandInteraction,
-        value: bool = commands.Param(
-            description="Whether to announce the next song in the queue automatically"
-        )
-    ):
-        """Set whether to auto-announce next song when track changes"""
-        await inter.response.defer()
-        
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(inter.guild.id))
-        
-        # Update setting
-        settings.autoAnnounceNextSong = value
-        await settings.save()
-        
-        await inter.followup.send("📣 Broadcast protocol updated: auto-announce setting configured")
+    )(_setter("autoAnnounceNextSong", bool, name="value", description="Whether to announce the next song in the queue automatically"))
     
-    @config_group.sub_command(
+    set_default_volume = config_group.sub_command(
         name="set-default-volume",
         description="Set default volume used when entering voice channel"
-    )
-    async def set_default_volume(
-        self,
-        inter: ApplicationCommandInteraction,
-        level: int = commands.Param(
-            description="Volume percentage (0-100)",
-            ge=0,
-            le=100
-        )
-    ):
-        """Set the default volume level"""
-        await inter.response.defer()
-        
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(inter.guild.id))
-        
-        # Update setting
-        settings.defaultVolume = level
-        await settings.save()
-        
-        await inter.followup.send(f"🔊 Audio gain calibrated: default volume set to {level}%")
+    )(_setter("defaultVolume", int, name="level", description="Volume percentage (0-100)", ge=0, le=100))
     
-    @config_group.sub_command(
+    set_default_queue_page_size = config_group.sub_command(
         name="set-default-queue-page-size",
         description="Set the default page size of the /queue command"
-    )
-    async def set_default_queue_page_size(
-        self,
-        inter: ApplicationCommandInteraction,
-        page_size: int = commands.Param(
-            description="Page size (1-30)",
-            ge=1,
-            le=30
-        )
-    ):
-        """Set the default page size for queue display"""
-        await inter.response.defer()
-        
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(inter.guild.id))
-        
-        # Update setting
-        settings.defaultQueuePageSize = page_size
-        await settings.save()
-        
-        await inter.followup.send("📋 Display parameters updated: queue page size configured")
+    )(_setter("defaultQueuePageSize", int, name="page_size", description="Page size (1-30)", ge=1, le=30))
     
-    @config_group.sub_command(
+    set_reduce_vol_when_voice = config_group.sub_command(
         name="set-reduce-vol-when-voice",
         description="Set whether to turn down volume when people speak"
-    )
-    async def set_reduce_vol_when_voice(
-        self,
-        inter: ApplicationCommandInteraction,
-        value: bool = commands.Param(
-            description="Whether to turn down volume when people speak"
-        )
-    ):
-        """Set whether to reduce volume when people speak"""
-        await inter.response.defer()
-        
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(inter.guild.id))
-        
-        # Update setting
-        settings.turnDownVolumeWhenPeopleSpeak = value
-        await settings.save()
-        
-        await inter.followup.send("🎤 Voice priority protocol updated: volume reduction during speech configured")
+    )(_setter("turnDownVolumeWhenPeopleSpeak", bool, name="value", description="Whether to turn down volume when people speak"))
     
-    @config_group.sub_command(
+    set_reduce_vol_when_voice_target = config_group.sub_command(
         name="set-reduce-vol-when-voice-target",
         description="Set the target volume when people speak"
-    )
-    async def set_reduce_vol_when_voice_target(
-        self,
-        inter: ApplicationCommandInteraction,
-        volume: int = commands.Param(
-            description="Volume percentage when people speak (0-100)",
-            ge=0,
-            le=100
-        )
-    ):
-        """Set the volume reduction target percentage"""
-        await inter.response.defer()
-        
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(inter.guild.id))
-        
-        # Update setting
-        settings.turnDownVolumeWhenPeopleSpeakTarget = volume
-        await settings.save()
-        
-        await inter.followup.send(f"🎚️ Voice priority threshold calibrated: speech volume set to {volume}%")
\ No newline at end of file
+    )(_setter("turnDownVolumeWhenPeopleSpeakTarget", int, name="volume", description="Volume percentage when people speak (0-100)", ge=0, le=100))
@@ -1,21 +1,73 @@
 # hertz/cogs/favorites.py
 import logging
-from typing import List, Optional
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 
 import disnake
 from disnake import ApplicationCommandInteraction
 from disnake.ext import commands
 
+from ..db.client import (
+    FavoriteQuery,
+    create_favorite_query,
+    delete_favorite_query,
+    get_favorite_queries,
+    get_favorite_query,
+    get_favorite_query_owned,
+    search_favorites,
+)
 from ..utils.error_msg import error_msg
 from ..utils.responses import Responses
 
 logger = logging.getLogger(__name__)
 
+_EMBED_COLOR = disnake.Color.blue()
+
+FAVORITES_TTL = 10  # Seconds a guild's favorites stay cached for autocomplete
+FAVORITES_CACHE_MAX = 500  # Guilds with more favorites are searched in the database instead
+
+_Entry = Tuple[str, FavoriteQuery]  # (lowercased name, favorite)
+
+# guild_id -> (expires_at, entries, entries bucketed by each character in the name)
+# entries is None for guilds too large to hold in memory
+_favorites_cache: Dict[str, Tuple[float, Optional[List[_Entry]], Optional[Dict[str, List[_Entry]]]]] = {}
+
+async def _cached_favorites(guild_id: str) -> Tuple[Optional[List[_Entry]], Optional[Dict[str, List[_Entry]]]]:
+    """Get a guild's favorites as (lowercased name, favorite) pairs, cached briefly"""
+    entry = _favorites_cache.get(guild_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1], entry[2]
+    
+    favorites = await get_favorite_queries(guild_id, limit=FAVORITES_CACHE_MAX + 1)
+    if len(favorites) > FAVORITES_CACHE_MAX:
+        _favorites_cache[guild_id] = (time.monotonic() + FAVORITES_TTL, None, None)
+        return None, None
+    
+    # Lowercase once here instead of on every keystroke
+    entries = [(f.name.lower(), f) for f in favorites]
+    
+    # A name can only contain the search string if it contains its first
+    # character, so bucketing by character prunes most names up front
+    by_char = defaultdict(list)
+    for item in entries:
+        for char in set(item[0]):
+            by_char[char].append(item)
+    
+    _favorites_cache[guild_id] = (time.monotonic() + FAVORITES_TTL, entries, by_char)
+    return entries, by_char
+
 class FavoritesCommands(commands.Cog):
     """Commands for managing favorites"""
     
     def __init__(self, bot):
         self.bot = bot
+        self._play_command = None
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Resolve the play command once commands are registered"""
+        self._play_command = self.bot.get_slash_command("play")
     
     @commands.slash_command(
         name="favorites",
@@ -62,16 +114,15 @@ class FavoritesCommands(commands.Cog):
             return
         
         # Get the favorite
-        from ..db.client import get_favorite_query
         favorite = await get_favorite_query(str(inter.guild.id), name)
         if not favorite:
             await inter.followup.send(error_msg("no favorite with that name exists"))
             return
         
-        logger.info(f"[COMMAND] {inter.author.display_name} used favorite '{name}'")
+        logger.info("[COMMAND] %s used favorite '%s'", inter.author.display_name, name)
         
         # Use play command to play this query
-        play_command = self.bot.get_slash_command("play")
+        play_command = self._play_command or self.bot.get_slash_command("play")
         if not play_command:
             await inter.followup.send(error_msg("play command not found"))
             return
@@ -93,36 +144,30 @@ class FavoritesCommands(commands.Cog):
         """List all favorites for this server"""
         await inter.response.defer()
         
-        from ..db.client import get_favorite_queries
         favorites = await get_favorite_queries(str(inter.guild.id))
         
         if not favorites:
             await inter.followup.send("📭 No saved frequencies found. Create favorites with `/favorites create`")
             return
         
-        logger.info(f"[COMMAND] {inter.author.display_name} listed favorites")
+        logger.info("[COMMAND] %s listed favorites", inter.author.display_name)
         
         # Create embed with favorites
         embed = disnake.Embed(
             title="🎵 Saved Frequencies",
             description="Your preferred tracks and playlists",
-            color=disnake.Color.blue()
+            color=_EMBED_COLOR
         )
         
-        # Group by author
-        favorites_by_author = {}
+        # Group by author, formatting each line once as we go
+        favorites_by_author = defaultdict(list)
         for fav in favorites:
-            if fav.authorId not in favorites_by_author:
-                favorites_by_author[fav.authorId] = []
-            favorites_by_author[fav.authorId].append(fav)
+            query_display = fav.query if len(fav.query) <= 50 else fav.query[:50] + "..."
+            favorites_by_author[fav.authorId].append(f"**{fav.name}**: {query_display}")
         
         # Add fields for each user's favorites
-        for author_id, favs in favorites_by_author.items():
-            # Format each favorite as a line in the field
-            field_value = "\n".join([
-                f"**{fav.name}**: {fav.query[:50]}{'...' if len(fav.query) > 50 else ''}"
-                for fav in favs
-            ])
+        for author_id, lines in favorites_by_author.items():
+            field_value = "\n".join(lines)
             
             embed.add_field(
                 name=f"<@{author_id}>'s Frequencies",
@@ -150,26 +195,27 @@ class FavoritesCommands(commands.Cog):
         """Create a new favorite"""
         await inter.response.defer()
         
-        # Check if favorite already exists
-        from ..db.client import get_favorite_query, create_favorite_query
-        existing = await get_favorite_query(str(inter.guild.id), name)
-        if existing:
-            await inter.followup.send(error_msg("a favorite with that name already exists"))
-            return
+        guild_id = str(inter.guild.id)
         
-        # Create the favorite
+        # Create the favorite; the unique (guild, name) index rejects duplicates
         try:
-            await create_favorite_query(
-                guild_id=str(inter.guild.id),
+            favorite = await create_favorite_query(
+                guild_id=guild_id,
                 author_id=str(inter.author.id),
                 name=name,
                 query=query
             )
             
-            logger.info(f"[COMMAND] {inter.author.display_name} created favorite '{name}'")
+            if favorite is None:
+                await inter.followup.send(error_msg("a favorite with that name already exists"))
+                return
+            
+            _favorites_cache.pop(guild_id, None)
+            
+            logger.info("[COMMAND] %s created favorite '%s'", inter.author.display_name, name)
             await inter.followup.send("💾 Frequency saved to presets! Ready for recall")
         except Exception as e:
-            logger.error(f"[ERROR] Error creating favorite: {e}")
+            logger.error("[ERROR] Error creating favorite: %s", e)
             await inter.followup.send(error_msg(str(e)))
     
     @favorites_group.sub_command(
@@ -187,26 +233,26 @@ class FavoritesCommands(commands.Cog):
         """Remove a favorite"""
         await inter.response.defer()
         
-        # Get the favorite
-        from ..db.client import get_favorite_query, delete_favorite_query
-        favorite = await get_favorite_query(str(inter.guild.id), name)
-        if not favorite:
-            await inter.followup.send(error_msg("no favorite with that name exists"))
-            return
+        guild_id = str(inter.guild.id)
         
-        # Check if user is allowed to remove
-        is_owner = inter.author.id == inter.guild.owner_id
-        if favorite.authorId != str(inter.author.id) and not is_owner:
-            await inter.followup.send(error_msg("you can only remove your own favorites"))
+        # Server owners can remove any favorite, everyone else only their own
+        author_filter = None if inter.author.id == inter.guild.owner_id else str(inter.author.id)
+        favorite = await get_favorite_query_owned(guild_id, name, author_filter)
+        if not favorite:
+            if author_filter is None:
+                await inter.followup.send(error_msg("no favorite with that name exists"))
+            else:
+                await inter.followup.send(error_msg("you have no favorite with that name"))
             return
         
         # Remove the favorite
         try:
             await delete_favorite_query(favorite.id)
-            logger.info(f"[COMMAND] {inter.author.display_name} removed favorite '{name}'")
+            _favorites_cache.pop(guild_id, None)
+            logger.info("[COMMAND] %s removed favorite '%s'", inter.author.display_name, name)
             await inter.followup.send("🗑️ Frequency deleted from presets")
         except Exception as e:
-            logger.error(f"[ERROR] Error removing favorite: {e}")
+            logger.error("[ERROR] Error removing favorite: %s", e)
             await inter.followup.send(error_msg(str(e)))
     
     @use_favorite.autocomplete("name")
@@ -218,24 +264,29 @@ class FavoritesCommands(commands.Cog):
     ):
         """Provide autocomplete for favorite names"""
         try:
-            # Get all favorites for this guild
-            from ..db.client import get_favorite_queries
-            favorites = await get_favorite_queries(str(inter.guild.id))
-            
-            # Filter by provided string
-            if string:
-                string = string.lower()
-                favorites = [
-                    f for f in favorites 
-                    if string in f.name.lower()
-                ]
+            guild_id = str(inter.guild.id)
             
             # For remove command, only show user's favorites unless they're the owner
+            author_id = None
             if inter.application_command.name == "remove" and inter.author.id != inter.guild.owner_id:
-                favorites = [
-                    f for f in favorites 
-                    if f.authorId == str(inter.author.id)
-                ]
+                author_id = str(inter.author.id)
+            
+            # Get all favorites for this guild
+            entries, by_char = await _cached_favorites(guild_id)
+            
+            # Too many to keep in memory, let the database filter and cap them
+            if entries is None:
+                favorites = await search_favorites(guild_id, string, author_id)
+            else:
+                # Filter by provided string
+                if string:
+                    string = string.lower()
+                    favorites = [f for name, f in by_char.get(string[0], ()) if string in name]
+                else:
+                    favorites = [f for _, f in entries]
+                
+                if author_id is not None:
+                    favorites = [f for f in favorites if f.authorId == author_id]
             
             # Return formatted choices (up to 25)
             return [
@@ -243,5 +294,5 @@ class FavoritesCommands(commands.Cog):
                 for f in favorites[:25]
             ]
         except Exception as e:
-            logger.error(f"[ERROR] Error in favorites autocomplete: {e}")
+            logger.error("[ERROR] Error in favorites autocomplete: %s", e)
             return []
\ No newline at end of file
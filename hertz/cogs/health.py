@@ -3,7 +3,7 @@ import os
 import logging
 import time
 import asyncio
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import disnake
 from disnake import ApplicationCommandInteraction
@@ -14,6 +14,31 @@ from ..utils.embeds import create_health_embed, create_cache_embed, create_music
 
 logger = logging.getLogger(__name__)
 
+EMBED_TTL = 3.0  # Seconds a built embed is reused
+
+# page_type -> (built_at, embed), shared by /health, /dashboard and its buttons
+_embed_cache: Dict[str, Tuple[float, disnake.Embed]] = {}
+
+async def get_page_embed(bot, page_type: str) -> disnake.Embed:
+    """Get the embed for a dashboard page, reusing one built within EMBED_TTL"""
+    # Reuse a recent embed so rapid tab switching doesn't rebuild stats
+    cached = _embed_cache.get(page_type)
+    if cached and time.monotonic() - cached[0] < EMBED_TTL:
+        return cached[1]
+    
+    if page_type == "health":
+        embed = create_health_embed(bot)
+    elif page_type == "cache":
+        embed = await create_cache_embed(bot)  # Note the await here!
+    elif page_type == "music":
+        embed = create_music_stats_embed(bot)
+    else:
+        # Default fallback
+        return disnake.Embed(title="Dashboard Error", description="Could not load page")
+    
+    _embed_cache[page_type] = (time.monotonic(), embed)
+    return embed
+
 class DashboardView(View):
     def __init__(self, bot, inter, timeout=60):
         super().__init__(timeout=timeout)
@@ -21,6 +46,7 @@ class DashboardView(View):
         self.inter = inter
         self.current_page = 0
         self.pages = ["health", "cache", "music"]
+        self._buttons = [self.health_button, self.cache_button, self.music_button]
     
     @disnake.ui.button(label="Health", style=disnake.ButtonStyle.primary, disabled=True)
     async def health_button(self, button: Button, interaction: disnake.MessageInteraction):
@@ -39,9 +65,8 @@ class DashboardView(View):
     
     async def update_view(self, interaction: disnake.MessageInteraction):
         # Update button states
-        for i, child in enumerate(self.children):
-            if hasattr(child, "disabled"):
-                child.disabled = (i == self.current_page)  # Disable current button
+        for i, button in enumerate(self._buttons):
+            button.disabled = (i == self.current_page)  # Disable current button
         
         # Get current embed
         embed = await self.get_current_embed()
@@ -50,17 +75,19 @@ class DashboardView(View):
         await interaction.response.edit_message(embed=embed, view=self)
     
     async def get_current_embed(self):
-        page_type = self.pages[self.current_page]
-        
-        if page_type == "health":
-            return create_health_embed(self.bot)
-        elif page_type == "cache":
-            return await create_cache_embed(self.bot)  # Note the await here!
-        elif page_type == "music":
-            return create_music_stats_embed(self.bot)
-        
-        # Default fallback
-        return disnake.Embed(title="Dashboard Error", description="Could not load page")
+        return await get_page_embed(self.bot, self.pages[self.current_page])
+    
+    async def warm(self):
+        """Build the other pages up front so the first tab switch is a lookup"""
+        # The health page was just built for the initial message
+        results = await asyncio.gather(
+            get_page_embed(self.bot, "cache"),
+            get_page_embed(self.bot, "music"),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error warming dashboard pages: %s", result)
 
 class HealthCommands(commands.Cog):
     """Commands for health check status and dashboard"""
@@ -79,12 +106,12 @@ class HealthCommands(commands.Cog):
         
         try:
             # Create health embed
-            embed = create_health_embed(self.bot)
+            embed = await get_page_embed(self.bot, "health")
             
             await inter.followup.send(embed=embed)
             
         except Exception as e:
-            logger.error(f"Error displaying health info: {e}")
+            logger.error("Error displaying health info: %s", e)
             await inter.followup.send("Error retrieving health information")
     
     @commands.slash_command(
@@ -97,14 +124,17 @@ class HealthCommands(commands.Cog):
         
         try:
             # Create initial health embed
-            embed = create_health_embed(self.bot)
+            embed = await get_page_embed(self.bot, "health")
             
             # Create the view with buttons
             view = DashboardView(self.bot, inter)
             
+            # Build the other pages while the initial message is sent
+            asyncio.create_task(view.warm())
+            
             # Send the message with the view
             await inter.followup.send(embed=embed, view=view)
             
         except Exception as e:
-            logger.error(f"Error displaying dashboard: {e}")
+            logger.error("Error displaying dashboard: %s", e)
             await inter.followup.send("Error retrieving dashboard information")
\ No newline at end of file
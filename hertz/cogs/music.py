@@ -1,13 +1,18 @@
 # hertz/cogs/music.py
+import asyncio
 import logging
+import random
 import re
-import urllib.parse
 from typing import List, Dict, Any, Optional
 
 import disnake
 from disnake import ApplicationCommandInteraction
 from disnake.ext import commands
 
+from ..db.settings_cache import get_guild_settings_cached
+from ..services.get_songs import GetSongs
+from ..services.player import Status
+from ..services.youtube import get_youtube_suggestions_cached, peek_youtube_suggestions
 from ..utils.voice import get_member_voice_channel, get_most_popular_voice_channel
 from ..utils.embeds import create_playing_embed
 from ..utils.error_msg import error_msg
@@ -15,11 +20,26 @@ from ..utils.responses import Responses
 
 logger = logging.getLogger(__name__)
 
+# Prefixes of the links people usually paste, checked before the regex
+_URL_PREFIXES = ("http://", "https://", "spotify:", "www.", "youtu.be/")
+
+# Scheme followed by "://" and a host, same test as urlparse scheme + netloc
+_URL_RE = re.compile(r'^[a-z][a-z0-9+.\-]*://[^/?#\s]', re.I)
+
+AUTOCOMPLETE_DEBOUNCE = 0.12  # Seconds to wait for the next keystroke before fetching
+
 class MusicCommands(commands.Cog):
     """Commands for playing music"""
     
     def __init__(self, bot):
         self.bot = bot
+        self.get_songs = GetSongs(bot.config)
+        self._pending: Dict[int, asyncio.Task] = {}  # author id -> pending suggestion fetch
+    
+    async def _debounced_suggestions(self, query: str) -> List[str]:
+        """Fetch suggestions after a short pause in typing"""
+        await asyncio.sleep(AUTOCOMPLETE_DEBOUNCE)
+        return await get_youtube_suggestions_cached(query)
     
     @commands.slash_command(
         name="play",
@@ -57,8 +77,7 @@ class MusicCommands(commands.Cog):
         
         try:
             # Get guild settings
-            from ..db.client import get_guild_settings
-            settings = await get_guild_settings(str(inter.guild.id))
+            settings = await get_guild_settings_cached(str(inter.guild.id))
             
             # Get player
             player = self.bot.player_manager.get_player(inter.guild.id)
@@ -70,12 +89,9 @@ class MusicCommands(commands.Cog):
                 voice_channel = get_most_popular_voice_channel(inter.guild)
                 
             # Get songs from query
-            from ..services.get_songs import GetSongs
-            get_songs = GetSongs(self.bot.config)
+            logger.info("[COMMAND] Play request from %s: %.50s...", inter.author.display_name, query)
             
-            logger.info(f"[COMMAND] Play request from {inter.author.display_name}: {query[:50]}...")
-            
-            new_songs, extra_msg = await get_songs.get_songs(
+            new_songs, extra_msg = await self.get_songs.get_songs(
                 query=query.strip(),
                 playlist_limit=settings.playlistLimit,
                 should_split_chapters=split
@@ -87,17 +103,16 @@ class MusicCommands(commands.Cog):
                 
             # Shuffle if requested
             if shuffle and len(new_songs) > 1:
-                import random
                 random.shuffle(new_songs)
-                logger.info(f"[COMMAND] Shuffled {len(new_songs)} tracks")
+                logger.info("[COMMAND] Shuffled %s tracks", len(new_songs))
                 
             # Add songs to queue
-            for song in new_songs:
-                player.add({
-                    **song,
-                    "added_in_channel_id": inter.channel.id,
-                    "requested_by": inter.author.id
-                }, immediate=immediate)
+            player.extend(
+                new_songs,
+                immediate=immediate,
+                channel_id=inter.channel.id,
+                requested_by=inter.author.id
+            )
                 
             # Connect to voice if not connected
             if not player.voice_client:
@@ -115,7 +130,7 @@ class MusicCommands(commands.Cog):
                 if status_msg:
                     response = status_msg
                 else:
-                    response = Responses.NOW_PLAYING.format(player.get_current().title)
+                    response = Responses.now_playing(player.get_current().title)
                     
                 await inter.followup.send(
                     content=response, 
@@ -125,7 +140,7 @@ class MusicCommands(commands.Cog):
                 return
                 
             # If player is idle, start playback
-            if player.status == player.Status.IDLE:
+            if player.status == Status.IDLE:
                 await player.play()
                 
             # Skip if requested
@@ -133,7 +148,7 @@ class MusicCommands(commands.Cog):
                 try:
                     await player.forward(1)
                 except Exception as e:
-                    logger.error(f"[ERROR] Skip failed: {str(e)}")
+                    logger.error("[ERROR] Skip failed: %s", e)
                     await inter.followup.send(error_msg("no track to skip to"), ephemeral=True)
                     return
                     
@@ -163,31 +178,49 @@ class MusicCommands(commands.Cog):
             )
                 
         except Exception as e:
-            logger.error(f"[ERROR] Play command error: {str(e)}")
+            logger.error("[ERROR] Play command error: %s", e)
             await inter.followup.send(error_msg(str(e)), ephemeral=True)
     
     @play.autocomplete("query")
     async def query_autocomplete(self, inter: ApplicationCommandInteraction, query: str):
         """Provide autocomplete suggestions for queries"""
-        if not query or len(query.strip()) < 2:
+        if len(query) < 2:
             return []
             
-        # Check if query looks like a URL
-        try:
-            result = urllib.parse.urlparse(query)
-            if all([result.scheme, result.netloc]):
-                # It's a URL, don't provide autocomplete
-                return []
-        except Exception:
-            pass
+        # It's a URL, don't provide autocomplete
+        if query.startswith(_URL_PREFIXES) or ("://" in query and _URL_RE.match(query)):
+            return []
+        
+        # Normalize once; the suggestion cache is keyed on this form
+        query = query.strip().lower()
+        if len(query) < 2:
+            return []
         
         # Get suggestions from YouTube
         try:
-            from ..services.youtube import get_youtube_suggestions
-            suggestions = await get_youtube_suggestions(query)
+            suggestions = peek_youtube_suggestions(query)
+            
+            if suggestions is None:
+                # Only the latest keystroke per user reaches the network
+                author_id = inter.author.id
+                previous = self._pending.get(author_id)
+                if previous is not None:
+                    previous.cancel()
+                
+                task = asyncio.create_task(self._debounced_suggestions(query))
+                self._pending[author_id] = task
+                try:
+                    suggestions = await task
+                except asyncio.CancelledError:
+                    if task.cancelled():
+                        return []
+                    raise
+                finally:
+                    if self._pending.get(author_id) is task:
+                        del self._pending[author_id]
         
             # Just return simple strings, not dictionaries
             return suggestions[:25]  # Discord limits to 25 choices
         except Exception as e:
-            logger.error(f"[ERROR] Autocomplete error: {str(e)}")
+            logger.error("[ERROR] Autocomplete error: %s", e)
             return []
\ No newline at end of file
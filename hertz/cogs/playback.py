@@ -6,8 +6,10 @@ import disnake
 from disnake import ApplicationCommandInteraction
 from disnake.ext import commands
 
+from ..services.player import Status
 from ..utils.embeds import create_playing_embed
-from ..utils.time import parse_time, parse_duration, pretty_time
+from ..utils.time import parse_any, pretty_time
+from ..utils.voice import require_voice
 from ..utils.error_msg import error_msg
 from ..utils.responses import Responses
 
@@ -23,37 +25,27 @@ class PlaybackCommands(commands.Cog):
         name="pause",
         description="Pause the current track"
     )
+    @require_voice
     async def pause(self, inter: ApplicationCommandInteraction):
         """Pause playback"""
-        await inter.response.defer()
-        
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
         
         try:
-            logger.info(f"[COMMAND] {inter.author.display_name} paused playback")
+            logger.info("[COMMAND] %s paused playback", inter.author.display_name)
             await player.pause()
-            await inter.followup.send(Responses.PAUSED)
+            await inter.response.send_message(Responses.PAUSED)
         except ValueError as e:
-            await inter.followup.send(error_msg(str(e)))
+            await inter.response.send_message(error_msg(str(e)))
     
     @commands.slash_command(
         name="resume",
         description="Resume playback"
     )
+    @require_voice
     async def resume(self, inter: ApplicationCommandInteraction):
         """Resume playing after being paused or disconnected"""
         await inter.response.defer()
         
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
         
         try:
@@ -62,9 +54,9 @@ class PlaybackCommands(commands.Cog):
                 await player.connect(inter.author.voice.channel)
             
             # If paused or has a current song, resume playback
-            if player.status == player.Status.PAUSED or player.get_current():
+            if player.status == Status.PAUSED or player.get_current():
                 # If we have a current song, try to resume from the tracked position
-                logger.info(f"[COMMAND] {inter.author.display_name} resumed playback")
+                logger.info("[COMMAND] %s resumed playback", inter.author.display_name)
                 await player.play()
                 
                 await inter.followup.send(
@@ -80,6 +72,7 @@ class PlaybackCommands(commands.Cog):
         name="skip",
         description="Skip the current track"
     )
+    @require_voice
     async def skip(
         self,
         inter: ApplicationCommandInteraction,
@@ -90,17 +83,25 @@ class PlaybackCommands(commands.Cog):
         )
     ):
         """Skip one or more songs"""
+        await self._do_skip(inter, number)
+    
+    @commands.slash_command(
+        name="next",
+        description="Skip to the next track (alias for /skip)"
+    )
+    @require_voice
+    async def next(self, inter: ApplicationCommandInteraction):
+        """Alias for /skip command"""
+        await self._do_skip(inter, 1)
+    
+    async def _do_skip(self, inter: ApplicationCommandInteraction, number: int):
+        """Shared body of /skip and /next"""
         await inter.response.defer()
         
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
         
         try:
-            logger.info(f"[COMMAND] {inter.author.display_name} skipped {number} tracks")
+            logger.info("[COMMAND] %s skipped %s tracks", inter.author.display_name, number)
             await player.forward(number)
             
             if player.get_current():
@@ -113,32 +114,19 @@ class PlaybackCommands(commands.Cog):
         except ValueError as e:
             await inter.followup.send(error_msg(str(e)))
     
-    @commands.slash_command(
-        name="next",
-        description="Skip to the next track (alias for /skip)"
-    )
-    async def next(self, inter: ApplicationCommandInteraction):
-        """Alias for /skip command"""
-        # Reuse the skip command with default parameters
-        await self.skip(inter, number=1)
-    
     @commands.slash_command(
         name="unskip",
         description="Go back to the previous track"
     )
+    @require_voice
     async def unskip(self, inter: ApplicationCommandInteraction):
         """Go back to the previous song in queue"""
         await inter.response.defer()
         
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
         
         try:
-            logger.info(f"[COMMAND] {inter.author.display_name} went back to previous track")
+            logger.info("[COMMAND] %s went back to previous track", inter.author.display_name)
             await player.back()
             await inter.followup.send(
                 content=Responses.PREVIOUS,
@@ -151,6 +139,7 @@ class PlaybackCommands(commands.Cog):
         name="seek",
         description="Seek to a position in the current track"
     )
+    @require_voice
     async def seek(
         self,
         inter: ApplicationCommandInteraction,
@@ -161,13 +150,9 @@ class PlaybackCommands(commands.Cog):
         """Seek to a specific position in the current song"""
         await inter.response.defer()
         
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
-        current_song = player.get_current()
+        snap = player.snapshot()
+        current_song = snap.current
         
         if not current_song:
             await inter.followup.send(error_msg("nothing is playing"))
@@ -178,21 +163,16 @@ class PlaybackCommands(commands.Cog):
             return
         
         try:
-            # Parse time value (handle different formats)
-            if ":" in time:
-                # Format like "1:30"
-                seek_time = parse_time(time)
-            else:
-                # Format like "90s" or "1m30s"
-                seek_time = parse_duration(time)
+            # Parse time value, like "1:30", "90s" or "1m30s"
+            seek_time = parse_any(time)
             
             if seek_time > current_song.length:
                 await inter.followup.send(error_msg("can't seek past the end of the track"))
                 return
             
-            logger.info(f"[COMMAND] {inter.author.display_name} seeked to {seek_time}s")
+            logger.info("[COMMAND] %s seeked to %ss", inter.author.display_name, seek_time)
             await player.seek(seek_time)
-            await inter.followup.send(Responses.SEEKED.format(pretty_time(player.get_position())))
+            await inter.followup.send(Responses.seeked(pretty_time(player.get_position())))
             
         except ValueError as e:
             await inter.followup.send(error_msg(str(e)))
@@ -201,6 +181,7 @@ class PlaybackCommands(commands.Cog):
         name="fseek",
         description="Seek forward in the current track"
     )
+    @require_voice
     async def fseek(
         self,
         inter: ApplicationCommandInteraction,
@@ -211,13 +192,9 @@ class PlaybackCommands(commands.Cog):
         """Seek forward by a specific amount of time"""
         await inter.response.defer()
         
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
-        current_song = player.get_current()
+        snap = player.snapshot()
+        current_song = snap.current
         
         if not current_song:
             await inter.followup.send(error_msg("nothing is playing"))
@@ -229,19 +206,15 @@ class PlaybackCommands(commands.Cog):
         
         try:
             # Parse time value
-            if ":" in time:
-                forward_time = parse_time(time)
-            else:
-                forward_time = parse_duration(time)
+            forward_time = parse_any(time)
             
-            current_position = player.get_position()
-            if current_position + forward_time > current_song.length:
+            if snap.position + forward_time > current_song.length:
                 await inter.followup.send(error_msg("can't seek past the end of the track"))
                 return
             
-            logger.info(f"[COMMAND] {inter.author.display_name} forward seeked by {forward_time}s")
+            logger.info("[COMMAND] %s forward seeked by %ss", inter.author.display_name, forward_time)
             await player.forward_seek(forward_time)
-            await inter.followup.send(Responses.SEEKED.format(pretty_time(player.get_position())))
+            await inter.followup.send(Responses.seeked(pretty_time(player.get_position())))
             
         except ValueError as e:
             await inter.followup.send(error_msg(str(e)))
@@ -250,17 +223,14 @@ class PlaybackCommands(commands.Cog):
         name="replay",
         description="Restart the current track"
     )
+    @require_voice
     async def replay(self, inter: ApplicationCommandInteraction):
         """Restart the current song from the beginning"""
         await inter.response.defer()
         
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
-        current_song = player.get_current()
+        snap = player.snapshot()
+        current_song = snap.current
         
         if not current_song:
             await inter.followup.send(error_msg("nothing is playing"))
@@ -271,7 +241,7 @@ class PlaybackCommands(commands.Cog):
             return
         
         try:
-            logger.info(f"[COMMAND] {inter.author.display_name} restarted current track")
+            logger.info("[COMMAND] %s restarted current track", inter.author.display_name)
             await player.seek(0)
             await inter.followup.send(Responses.REPLAYED)
         except ValueError as e:
@@ -281,37 +251,28 @@ class PlaybackCommands(commands.Cog):
         name="loop",
         description="Toggle looping the current track"
     )
+    @require_voice
     async def loop(self, inter: ApplicationCommandInteraction):
         """Toggle looping the current song"""
-        await inter.response.defer()
-        
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
         
-        if player.status == player.Status.IDLE:
-            await inter.followup.send(error_msg("no track to loop!"))
+        if player.status == Status.IDLE:
+            await inter.response.send_message(error_msg("no track to loop!"))
             return
         
-        # Disable queue looping if enabled
-        if player.loop_current_queue:
-            player.loop_current_queue = False
-        
-        # Toggle song looping
-        player.loop_current_song = not player.loop_current_song
+        # Toggle song looping, which also turns off queue looping
+        enabled = player.toggle_loop_song()
         
-        logger.info(f"[COMMAND] {inter.author.display_name} {'enabled' if player.loop_current_song else 'disabled'} track loop")
-        await inter.followup.send(
-            Responses.LOOPING if player.loop_current_song else Responses.LOOP_STOPPED
+        logger.info("[COMMAND] %s %s track loop", inter.author.display_name, 'enabled' if enabled else 'disabled')
+        await inter.response.send_message(
+            Responses.LOOPING if enabled else Responses.LOOP_STOPPED
         )
     
     @commands.slash_command(
         name="volume",
         description="Set playback volume"
     )
+    @require_voice
     async def volume(
         self,
         inter: ApplicationCommandInteraction,
@@ -322,69 +283,52 @@ class PlaybackCommands(commands.Cog):
         )
     ):
         """Set the volume level"""
-        await inter.response.defer()
-        
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
         
         if not player.get_current():
-            await inter.followup.send(error_msg("nothing is playing"))
+            await inter.response.send_message(error_msg("nothing is playing"))
             return
         
-        logger.info(f"[COMMAND] {inter.author.display_name} set volume to {level}%")
+        logger.info("[COMMAND] %s set volume to %s%%", inter.author.display_name, level)
         player.set_volume(level)
-        await inter.followup.send(Responses.VOLUME_SET.format(level))
+        await inter.response.send_message(Responses.volume_set(level))
     
     @commands.slash_command(
         name="disconnect",
         description="Pause and disconnect from voice channel"
     )
+    @require_voice
     async def disconnect(self, inter: ApplicationCommandInteraction):
         """Disconnect the bot from the voice channel"""
-        await inter.response.defer()
-        
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
         
         if not player.voice_client:
-            await inter.followup.send(error_msg("not connected"))
+            await inter.response.send_message(error_msg("not connected"))
             return
         
-        logger.info(f"[COMMAND] {inter.author.display_name} disconnected bot from voice")
+        logger.info("[COMMAND] %s disconnected bot from voice", inter.author.display_name)
         await player.disconnect()
-        await inter.followup.send(Responses.DISCONNECTED)
+        await inter.response.send_message(Responses.DISCONNECTED)
     
     @commands.slash_command(
         name="stop",
         description="Stop playback, disconnect, and clear all tracks"
     )
+    @require_voice
     async def stop(self, inter: ApplicationCommandInteraction):
         """Stop playback, disconnect, and clear the queue"""
         await inter.response.defer()
         
-        # Check if user is in voice
-        if not inter.author.voice:
-            await inter.followup.send(error_msg("you need to be in a voice channel"))
-            return
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
         
         if not player.voice_client:
             await inter.followup.send(error_msg("not connected"))
             return
         
-        if player.status != player.Status.PLAYING:
+        if player.status != Status.PLAYING:
             await inter.followup.send(error_msg("not currently playing"))
             return
         
-        logger.info(f"[COMMAND] {inter.author.display_name} stopped playback and cleared queue")
+        logger.info("[COMMAND] %s stopped playback and cleared queue", inter.author.display_name)
         await player.stop()
         await inter.followup.send(Responses.STOPPED)
\ No newline at end of file
@@ -6,6 +6,9 @@ import disnake
 from disnake import ApplicationCommandInteraction
 from disnake.ext import commands
 
+from ..db.client import Setting
+from ..db.settings_cache import get_guild_setting
+from ..services.player import Status
 from ..utils.embeds import create_queue_embed, create_playing_embed
 from ..utils.error_msg import error_msg
 from ..utils.responses import Responses
@@ -15,6 +18,9 @@ logger = logging.getLogger(__name__)
 class QueueCommands(commands.Cog):
     """Commands for queue management"""
     
+    # Every queue command is deferred by the bot before its handler runs
+    auto_defer = True
+    
     def __init__(self, bot):
         self.bot = bot
     
@@ -38,8 +44,6 @@ class QueueCommands(commands.Cog):
         )
     ):
         """Show the songs currently in the queue"""
-        await inter.response.defer()
-        
         try:
             guild_id = str(inter.guild.id)
             player = self.bot.player_manager.get_player(inter.guild.id)
@@ -51,11 +55,9 @@ class QueueCommands(commands.Cog):
             
             # Get default page size from settings if not specified
             if page_size is None:
-                from ..db.client import get_guild_settings
-                settings = await get_guild_settings(guild_id)
-                page_size = settings.defaultQueuePageSize
+                page_size = await get_guild_setting(guild_id, Setting.defaultQueuePageSize)
             
-            logger.info(f"[COMMAND] {inter.author.display_name} viewed queue (page {page}, size {page_size})")
+            logger.info("[COMMAND] %s viewed queue (page %s, size %s)", inter.author.display_name, page, page_size)
             
             # Create and send embed
             embed = create_queue_embed(player, page, page_size)
@@ -64,7 +66,7 @@ class QueueCommands(commands.Cog):
         except ValueError as e:
             await inter.followup.send(error_msg(str(e)))
         except Exception as e:
-            logger.error(f"[ERROR] Queue command error: {e}")
+            logger.error("[ERROR] Queue command error: %s", e)
             await inter.followup.send(error_msg("An error occurred"))
     
     @commands.slash_command(
@@ -73,8 +75,6 @@ class QueueCommands(commands.Cog):
     )
     async def now_playing(self, inter: ApplicationCommandInteraction):
         """Show only the currently playing song without the full queue"""
-        await inter.response.defer()
-        
         player = self.bot.player_manager.get_player(inter.guild.id)
         
         # Check if anything is playing
@@ -82,7 +82,7 @@ class QueueCommands(commands.Cog):
             await inter.followup.send(error_msg("nothing is currently playing"))
             return
         
-        logger.info(f"[COMMAND] {inter.author.display_name} requested now playing info")
+        logger.info("[COMMAND] %s requested now playing info", inter.author.display_name)
         
         # Create and send embed
         embed = create_playing_embed(player)
@@ -94,15 +94,13 @@ class QueueCommands(commands.Cog):
     )
     async def clear(self, inter: ApplicationCommandInteraction):
         """Clear the queue but keep the current song"""
-        await inter.response.defer()
-        
         # Check if user is in voice
         if not inter.author.voice:
             await inter.followup.send(error_msg("you need to be in a voice channel"))
             return
         
         player = self.bot.player_manager.get_player(inter.guild.id)
-        logger.info(f"[COMMAND] {inter.author.display_name} cleared the queue")
+        logger.info("[COMMAND] %s cleared the queue", inter.author.display_name)
         player.clear()
         
         await inter.followup.send(Responses.QUEUE_CLEARED)
@@ -126,8 +124,6 @@ class QueueCommands(commands.Cog):
         )
     ):
         """Remove one or more songs from the queue"""
-        await inter.response.defer()
-        
         # Check if user is in voice
         if not inter.author.voice:
             await inter.followup.send(error_msg("you need to be in a voice channel"))
@@ -136,13 +132,13 @@ class QueueCommands(commands.Cog):
         player = self.bot.player_manager.get_player(inter.guild.id)
         
         try:
-            logger.info(f"[COMMAND] {inter.author.display_name} removed {range} tracks starting at position {position}")
+            logger.info("[COMMAND] %s removed %s tracks starting at position %s", inter.author.display_name, range, position)
             player.remove_from_queue(position, range)
             await inter.followup.send("🗑️ Tracks removed from playlist")
         except IndexError:
             await inter.followup.send(error_msg("Invalid queue position"))
         except Exception as e:
-            logger.error(f"[ERROR] Remove command error: {e}")
+            logger.error("[ERROR] Remove command error: %s", e)
             await inter.followup.send(error_msg(str(e)))
     
     @commands.slash_command(
@@ -164,8 +160,6 @@ class QueueCommands(commands.Cog):
         )
     ):
         """Move a song within the queue"""
-        await inter.response.defer()
-        
         # Check if user is in voice
         if not inter.author.voice:
             await inter.followup.send(error_msg("you need to be in a voice channel"))
@@ -174,7 +168,7 @@ class QueueCommands(commands.Cog):
         player = self.bot.player_manager.get_player(inter.guild.id)
         
         try:
-            logger.info(f"[COMMAND] {inter.author.display_name} moved track from position {from_pos} to {to_pos}")
+            logger.info("[COMMAND] %s moved track from position %s to %s", inter.author.display_name, from_pos, to_pos)
             song = player.move(from_pos, to_pos)
             await inter.followup.send(f"🔀 **{song.title}** repositioned to slot **{to_pos}**")
         except IndexError:
@@ -188,8 +182,6 @@ class QueueCommands(commands.Cog):
     )
     async def shuffle(self, inter: ApplicationCommandInteraction):
         """Randomly shuffle all upcoming songs in the queue"""
-        await inter.response.defer()
-        
         # Check if user is in voice
         if not inter.author.voice:
             await inter.followup.send(error_msg("you need to be in a voice channel"))
@@ -201,7 +193,7 @@ class QueueCommands(commands.Cog):
             await inter.followup.send(error_msg("not enough tracks to shuffle"))
             return
         
-        logger.info(f"[COMMAND] {inter.author.display_name} shuffled the queue")
+        logger.info("[COMMAND] %s shuffled the queue", inter.author.display_name)
         player.shuffle()
         await inter.followup.send(Responses.SHUFFLED)
     
@@ -211,8 +203,6 @@ class QueueCommands(commands.Cog):
     )
     async def loop_queue(self, inter: ApplicationCommandInteraction):
         """Toggle queue looping mode"""
-        await inter.response.defer()
-        
         # Check if user is in voice
         if not inter.author.voice:
             await inter.followup.send(error_msg("you need to be in a voice channel"))
@@ -220,7 +210,7 @@ class QueueCommands(commands.Cog):
         
         player = self.bot.player_manager.get_player(inter.guild.id)
         
-        if player.status == player.Status.IDLE:
+        if player.status == Status.IDLE:
             await inter.followup.send(error_msg("no tracks to loop!"))
             return
         
@@ -235,7 +225,7 @@ class QueueCommands(commands.Cog):
         # Toggle queue looping
         player.loop_current_queue = not player.loop_current_queue
         
-        logger.info(f"[COMMAND] {inter.author.display_name} {'enabled' if player.loop_current_queue else 'disabled'} queue loop")
+        logger.info("[COMMAND] %s %s queue loop", inter.author.display_name, 'enabled' if player.loop_current_queue else 'disabled')
         await inter.followup.send(
             Responses.QUEUE_LOOPING if player.loop_current_queue else Responses.QUEUE_LOOP_STOPPED
         )
\ No newline at end of file
@@ -6,9 +6,21 @@ from enum import Enum
 from pathlib import Path
 import re
 
+import disnake
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Size strings like "2GB" or "512MB"
+_SIZE_RE = re.compile(r"^([\d.]+)([KMGT]?B)?$")
+_SIZE_UNITS = {
+    "B": 1,
+    "KB": 1024,
+    "MB": 1024**2,
+    "GB": 1024**3,
+    "TB": 1024**4
+}
+
 class ActivityType(str, Enum):
     """Discord bot activity types"""
     PLAYING = "PLAYING"
@@ -48,6 +60,16 @@ class Config:
         # Cache settings
         self.CACHE_LIMIT = os.environ.get("CACHE_LIMIT", "2GB")
         self.cache_limit_bytes = self._parse_size(self.CACHE_LIMIT)
+        # "tiered" evicts rarely replayed files first, "lru" purely by last access
+        self.CACHE_EVICTION = os.environ.get("CACHE_EVICTION", "tiered").lower()
+        
+        # Outbound API rate limits, in requests started per second (0 disables)
+        self.YOUTUBE_REQUESTS_PER_SECOND = float(os.environ.get("YOUTUBE_REQUESTS_PER_SECOND", "10"))
+        self.SPOTIFY_REQUESTS_PER_SECOND = float(os.environ.get("SPOTIFY_REQUESTS_PER_SECOND", "10"))
+        
+        # Playlist metadata resolution
+        self.METADATA_CONCURRENCY = int(os.environ.get("METADATA_CONCURRENCY", "10"))
+        self.METADATA_TIMEOUT = float(os.environ.get("METADATA_TIMEOUT", "10"))
         
         # Bot appearance
         self.BOT_STATUS = self._parse_status(os.environ.get("BOT_STATUS", "online"))
@@ -79,32 +101,24 @@ class Config:
     
     def _parse_size(self, size_str: str) -> int:
         """Parse a string like '2GB' into bytes"""
-        units = {
-            "B": 1,
-            "KB": 1024,
-            "MB": 1024**2,
-            "GB": 1024**3,
-            "TB": 1024**4
-        }
-        
         # Use regex to extract number and unit
-        match = re.match(r"^([\d.]+)([KMGT]?B)?$", size_str.upper())
+        match = _SIZE_RE.match(size_str.upper())
         if not match:
-            logger.warning(f"Invalid size format: {size_str}, using default of 2GB")
+            logger.warning("Invalid size format: %s, using default of 2GB", size_str)
             return 2 * 1024**3
         
         number, unit = match.groups()
         number = float(number)
         unit = unit or "B"  # Default to bytes if no unit specified
         
-        return int(number * units.get(unit, 1))
+        return int(number * _SIZE_UNITS.get(unit, 1))
     
     def _parse_status(self, status_str: str) -> Status:
         """Parse and validate bot status"""
         try:
             return Status(status_str.lower())
         except ValueError:
-            logger.warning(f"Invalid status: {status_str}, using default of 'online'")
+            logger.warning("Invalid status: %s, using default of 'online'", status_str)
             return Status.ONLINE
     
     def _parse_activity_type(self, activity_str: str) -> ActivityType:
@@ -112,7 +126,7 @@ class Config:
         try:
             return ActivityType(activity_str.upper())
         except ValueError:
-            logger.warning(f"Invalid activity type: {activity_str}, using default of 'LISTENING'")
+            logger.warning("Invalid activity type: %s, using default of 'LISTENING'", activity_str)
             return ActivityType.LISTENING
     
     def _parse_test_guilds(self, guilds_str: str) -> List[int]:
@@ -123,7 +137,7 @@ class Config:
         try:
             return [int(guild_id.strip()) for guild_id in guilds_str.split(",") if guild_id.strip()]
         except ValueError:
-            logger.warning(f"Invalid test guilds format: {guilds_str}, must be comma-separated IDs")
+            logger.warning("Invalid test guilds format: %s, must be comma-separated IDs", guilds_str)
             return []
     
     def _verify_directories(self):
@@ -137,11 +151,14 @@ class Config:
             return
             
         logger.debug("HERTZ Configuration:")
-        logger.debug(f"- Data directory: {self.DATA_DIR}")
-        logger.debug(f"- Cache directory: {self.CACHE_DIR}")
-        logger.debug(f"- Cache limit: {self.CACHE_LIMIT} ({self.cache_limit_bytes} bytes)")
-        logger.debug(f"- Bot status: {self.BOT_STATUS}")
-        logger.debug(f"- Bot activity: {self.BOT_ACTIVITY_TYPE} {self.BOT_ACTIVITY}")
+        logger.debug("- Data directory: %s", self.DATA_DIR)
+        logger.debug("- Cache directory: %s", self.CACHE_DIR)
+        logger.debug("- Cache limit: %s (%s bytes)", self.CACHE_LIMIT, self.cache_limit_bytes)
+        logger.debug("- Cache eviction: %s", self.CACHE_EVICTION)
+        logger.debug("- API rate limits: YouTube %s/s, Spotify %s/s", self.YOUTUBE_REQUESTS_PER_SECOND, self.SPOTIFY_REQUESTS_PER_SECOND)
+        logger.debug("- Metadata lookups: %s concurrent, %ss timeout", self.METADATA_CONCURRENCY, self.METADATA_TIMEOUT)
+        logger.debug("- Bot status: %s", self.BOT_STATUS)
+        logger.debug("- Bot activity: %s %s", self.BOT_ACTIVITY_TYPE, self.BOT_ACTIVITY)
         
         if self.SPOTIFY_CLIENT_ID and self.SPOTIFY_CLIENT_SECRET:
             logger.debug("- Spotify integration: Enabled")
@@ -149,8 +166,14 @@ class Config:
             logger.debug("- Spotify integration: Disabled")
             
         if self.TEST_GUILDS:
-            logger.debug(f"- Test guilds: {', '.join(map(str, self.TEST_GUILDS))}")
+            logger.debug("- Test guilds: %s", ', '.join(map(str, self.TEST_GUILDS)))
 
 def load_config() -> Config:
     """Load configuration from environment variables"""
-    return Config()
\ No newline at end of file
+    config = Config()
+    
+    # Resolve bot appearance to disnake enums once so the bot can use them directly
+    config.BOT_ACTIVITY_TYPE = getattr(disnake.ActivityType, config.BOT_ACTIVITY_TYPE.lower())
+    config.BOT_STATUS = getattr(disnake.Status, config.BOT_STATUS.lower())
+    
+    return config
\ No newline at end of file
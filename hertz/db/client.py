@@ -1,97 +1,141 @@
 # hertz/db/client.py
 import os
 import asyncio
+import enum
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, select, func, delete, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from sqlalchemy import Index, case, event, inspect, select, text, func, delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 logger = logging.getLogger(__name__)
 
 # Base class for SQLAlchemy models
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
 
-# Database models
+# Database models; Optional columns are nullable, matching the original schema
 class Setting(Base):
     __tablename__ = 'settings'
     
-    guildId = Column(String, primary_key=True)
-    playlistLimit = Column(Integer, default=50)
-    secondsToWaitAfterQueueEmpties = Column(Integer, default=30)
-    leaveIfNoListeners = Column(Boolean, default=True)
-    queueAddResponseEphemeral = Column(Boolean, default=False)
-    autoAnnounceNextSong = Column(Boolean, default=False)
-    defaultVolume = Column(Integer, default=100)
-    defaultQueuePageSize = Column(Integer, default=10)
-    turnDownVolumeWhenPeopleSpeak = Column(Boolean, default=False)
-    turnDownVolumeWhenPeopleSpeakTarget = Column(Integer, default=20)
-    createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    guildId: Mapped[str] = mapped_column(primary_key=True)
+    playlistLimit: Mapped[Optional[int]] = mapped_column(default=50)
+    secondsToWaitAfterQueueEmpties: Mapped[Optional[int]] = mapped_column(default=30)
+    leaveIfNoListeners: Mapped[Optional[bool]] = mapped_column(default=True)
+    queueAddResponseEphemeral: Mapped[Optional[bool]] = mapped_column(default=False)
+    autoAnnounceNextSong: Mapped[Optional[bool]] = mapped_column(default=False)
+    defaultVolume: Mapped[Optional[int]] = mapped_column(default=100)
+    defaultQueuePageSize: Mapped[Optional[int]] = mapped_column(default=10)
+    turnDownVolumeWhenPeopleSpeak: Mapped[Optional[bool]] = mapped_column(default=False)
+    turnDownVolumeWhenPeopleSpeakTarget: Mapped[Optional[int]] = mapped_column(default=20)
+    createdAt: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow)
+    updatedAt: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
     
     async def save(self):
         """Save changes to the database"""
+        # Set client-side so the committed object is current without a refresh SELECT
+        self.updatedAt = datetime.utcnow()
         async with (await get_session()) as session:
             session.add(self)
             await session.commit()
-            await session.refresh(self)
 
 class FavoriteQuery(Base):
     __tablename__ = 'favorite_queries'
+    __table_args__ = (
+        Index('ix_favorite_queries_guild_name', 'guildId', 'name', unique=True),
+    )
     
-    id = Column(Integer, primary_key=True)
-    guildId = Column(String, nullable=False)
-    authorId = Column(String, nullable=False)
-    name = Column(String, nullable=False)
-    query = Column(String, nullable=False)
-    createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    guildId: Mapped[str]
+    authorId: Mapped[str]
+    name: Mapped[str]
+    query: Mapped[str]
+    createdAt: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow)
+    updatedAt: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
     
     async def save(self):
         """Save changes to the database"""
+        # Set client-side so the committed object is current without a refresh SELECT
+        self.updatedAt = datetime.utcnow()
         async with (await get_session()) as session:
             session.add(self)
             await session.commit()
-            await session.refresh(self)
+
+class CacheTier(enum.IntEnum):
+    """Usage tiers for cached files; eviction empties lower tiers first"""
+    NO_USE = 0    # Cached but never played again
+    LOW_USE = 1   # Played again at least once
+    HIGH_USE = 2  # Played HIGH_USE_ACCESSES times or more
+
+HIGH_USE_ACCESSES = 4
 
 class FileCache(Base):
     __tablename__ = 'file_caches'
+    __table_args__ = (
+        Index('ix_file_caches_accessed_at', 'accessedAt'),
+        Index('ix_file_caches_tier_accessed_at', 'tier', 'accessedAt'),
+    )
     
-    hash = Column(String, primary_key=True)
-    bytes = Column(Integer, nullable=False)
-    accessedAt = Column(DateTime, nullable=False)
-    createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    hash: Mapped[str] = mapped_column(primary_key=True)
+    bytes: Mapped[int]
+    accessedAt: Mapped[datetime]
+    tier: Mapped[int] = mapped_column(default=CacheTier.NO_USE, server_default=text("0"))
+    accessCount: Mapped[int] = mapped_column(default=1, server_default=text("1"))
+    createdAt: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow)
+    updatedAt: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
     
     async def save(self):
         """Save changes to the database"""
+        # Set client-side so the committed object is current without a refresh SELECT
+        self.updatedAt = datetime.utcnow()
         async with (await get_session()) as session:
             session.add(self)
             await session.commit()
-            await session.refresh(self)
 
 class KeyValueCache(Base):
     __tablename__ = 'key_value_caches'
     
-    key = Column(String, primary_key=True)
-    value = Column(String, nullable=False)
-    expiresAt = Column(DateTime, nullable=False)
-    createdAt = Column(DateTime, default=datetime.utcnow)
-    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    key: Mapped[str] = mapped_column(primary_key=True)
+    value: Mapped[str]
+    expiresAt: Mapped[datetime]
+    createdAt: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow)
+    updatedAt: Mapped[Optional[datetime]] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
     
     async def save(self):
         """Save changes to the database"""
+        # Set client-side so the committed object is current without a refresh SELECT
+        self.updatedAt = datetime.utcnow()
         async with (await get_session()) as session:
             session.add(self)
             await session.commit()
-            await session.refresh(self)
 
 # Database engine and session
 _engine = None
 _async_session = None
 
+# Applied to every new connection; WAL lets reads run alongside a writer and
+# synchronous=NORMAL only syncs at checkpoints, which WAL keeps crash-safe
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune a freshly opened SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 async def get_engine():
     """Get or create SQLAlchemy engine"""
     global _engine
@@ -104,8 +148,9 @@ async def get_engine():
         
         # Create engine
         database_url = f"sqlite+aiosqlite:///{db_path}"
-        logger.info(f"Creating database engine with URL: {database_url}")
+        logger.info("Creating database engine with URL: %s", database_url)
         _engine = create_async_engine(database_url, echo=False)
+        event.listen(_engine.sync_engine, "connect", _set_sqlite_pragmas)
     
     return _engine
 
@@ -133,24 +178,69 @@ async def initialize_db():
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
             
+        # create_all skips columns and indexes on tables that already existed
+        await _ensure_columns(engine)
+        await _dedupe_favorites(engine)
+        await _ensure_indexes(engine)
+            
         logger.info("Database tables created successfully")
         
         # Test database connection and tables
         async with (await get_session()) as session:
             try:
-                # Try a simple query to verify tables exist
-                test_query = select(Setting).limit(1)
+                # Try a simple query to verify tables exist; selecting a bare
+                # column returns a plain row instead of building a Setting
+                test_query = select(Setting.guildId).limit(1)
                 await session.execute(test_query)
                 logger.info("Database connection verified")
             except Exception as e:
-                logger.error(f"Database test query failed: {e}")
+                logger.error("Database test query failed: %s", e)
                 raise
         
         logger.info("Database initialized successfully")
     except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
+        logger.error("Database initialization failed: %s", e)
         raise
 
+async def _ensure_columns(engine) -> None:
+    """Add columns introduced after a table was first created, using their server defaults"""
+    def add_missing(sync_conn) -> None:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspect(sync_conn).get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.server_default is not None:
+                    column_type = column.type.compile(dialect=sync_conn.dialect)
+                    default = column.server_default.arg.text
+                    sync_conn.execute(text(
+                        f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type} NOT NULL DEFAULT {default}'
+                    ))
+                    logger.info("Added column %s.%s", table.name, column.name)
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(add_missing)
+
+async def _dedupe_favorites(engine) -> None:
+    """Drop duplicate (guild, name) favorites, keeping the oldest, so the unique index can be built"""
+    keep = select(func.min(FavoriteQuery.id)).group_by(FavoriteQuery.guildId, FavoriteQuery.name)
+    async with engine.begin() as conn:
+        result = await conn.execute(delete(FavoriteQuery).where(FavoriteQuery.id.not_in(keep)))
+    
+    if result.rowcount:
+        logger.warning("Removed %d duplicate favorites", result.rowcount)
+
+async def _ensure_indexes(engine) -> None:
+    """Create indexes added after a table was first created"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+            except Exception as e:
+                # Duplicate checks rely on unique indexes, so don't run without one
+                if index.unique:
+                    raise
+                logger.warning("Could not create index %s: %s", index.name, e)
+
 async def get_guild_settings(guild_id: str) -> Setting:
     """Get settings for a guild, creating defaults if needed"""
     async with (await get_session()) as session:
@@ -160,18 +250,90 @@ async def get_guild_settings(guild_id: str) -> Setting:
         )
         settings = result.scalars().first()
         
-        # Create new settings if not found
+        # Create new settings if not found, getting the row back from the insert itself
         if not settings:
-            logger.info(f"Creating default settings for guild {guild_id}")
-            settings = Setting(guildId=guild_id)
-            session.add(settings)
+            logger.info("Creating default settings for guild %s", guild_id)
+            stmt = (
+                sqlite_insert(Setting)
+                .values(guildId=guild_id)
+                .on_conflict_do_nothing(index_elements=[Setting.guildId])
+                .returning(Setting)
+            )
+            result = await session.execute(stmt)
+            settings = result.scalars().first()
             await session.commit()
-            await session.refresh(settings)
+            
+            # Another task created the row between our select and insert
+            if settings is None:
+                result = await session.execute(
+                    select(Setting).where(Setting.guildId == guild_id)
+                )
+                settings = result.scalars().first()
         
         return settings
 
-async def create_favorite_query(guild_id: str, author_id: str, name: str, query: str) -> FavoriteQuery:
-    """Create a new favorite query"""
+async def get_guild_setting_column(guild_id: str, column) -> Any:
+    """Read one settings column for a guild without building a Setting, falling back to its default"""
+    async with (await get_session()) as session:
+        result = await session.execute(
+            select(column).where(Setting.guildId == guild_id)
+        )
+        value = result.scalar_one_or_none()
+    
+    if value is None:
+        default = Setting.__table__.c[column.key].default
+        value = default.arg if default is not None else None
+    
+    return value
+
+_IN_CHUNK = 500  # Stay under SQLite's bound parameter limit
+
+async def get_guild_settings_many(guild_ids: List[str]) -> List[Setting]:
+    """Get the existing settings rows of the given guilds, in one query per chunk"""
+    rows = []
+    async with (await get_session()) as session:
+        for i in range(0, len(guild_ids), _IN_CHUNK):
+            result = await session.execute(
+                select(Setting).where(Setting.guildId.in_(guild_ids[i:i + _IN_CHUNK]))
+            )
+            rows.extend(result.scalars().all())
+    return rows
+
+async def create_default_settings(guild_ids: List[str]) -> List[Setting]:
+    """Create default settings for many guilds in one batched insert and return their rows"""
+    if not guild_ids:
+        return []
+    
+    async with (await get_session()) as session:
+        # A parameter list runs as a single multi-row INSERT (insertmanyvalues)
+        await session.execute(
+            sqlite_insert(Setting).on_conflict_do_nothing(index_elements=[Setting.guildId]),
+            [{"guildId": guild_id} for guild_id in guild_ids]
+        )
+        await session.commit()
+        
+        result = await session.execute(
+            select(Setting).where(Setting.guildId.in_(guild_ids))
+        )
+        return list(result.scalars().all())
+
+async def update_guild_setting(guild_id: str, field: str, value: Any) -> None:
+    """Set a single guild setting in one statement, creating the row if needed"""
+    if field not in Setting.__table__.columns:
+        raise ValueError(f"Unknown setting: {field}")
+    
+    stmt = sqlite_insert(Setting).values(guildId=guild_id, **{field: value})
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Setting.guildId],
+        set_={field: value, "updatedAt": datetime.utcnow()}
+    )
+    
+    async with (await get_session()) as session:
+        await session.execute(stmt)
+        await session.commit()
+
+async def create_favorite_query(guild_id: str, author_id: str, name: str, query: str) -> Optional[FavoriteQuery]:
+    """Create a new favorite query, returning None if the name is already taken in the guild"""
     async with (await get_session()) as session:
         favorite = FavoriteQuery(
             guildId=guild_id,
@@ -180,15 +342,36 @@ async def create_favorite_query(guild_id: str, author_id: str, name: str, query:
             query=query
         )
         session.add(favorite)
-        await session.commit()
-        await session.refresh(favorite)
+        try:
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            return None
         return favorite
 
-async def get_favorite_queries(guild_id: str) -> List[FavoriteQuery]:
-    """Get all favorite queries for a guild"""
+async def get_favorite_queries(guild_id: str, limit: Optional[int] = None) -> List[FavoriteQuery]:
+    """Get all favorite queries for a guild, optionally capped at limit rows"""
+    async with (await get_session()) as session:
+        stmt = select(FavoriteQuery).where(FavoriteQuery.guildId == guild_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+async def search_favorites(guild_id: str, query: str, author_id: Optional[str] = None, limit: int = 25) -> List[FavoriteQuery]:
+    """Find favorites whose name contains query, capped at limit rows"""
+    # SQLite LIKE is already case-insensitive for ASCII; escape the wildcards in user input
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    conditions = [
+        FavoriteQuery.guildId == guild_id,
+        FavoriteQuery.name.like(f"%{escaped}%", escape="\\")
+    ]
+    if author_id is not None:
+        conditions.append(FavoriteQuery.authorId == author_id)
+    
     async with (await get_session()) as session:
         result = await session.execute(
-            select(FavoriteQuery).where(FavoriteQuery.guildId == guild_id)
+            select(FavoriteQuery).where(*conditions).order_by(FavoriteQuery.name).limit(limit)
         )
         return list(result.scalars().all())
 
@@ -203,6 +386,16 @@ async def get_favorite_query(guild_id: str, name: str) -> Optional[FavoriteQuery
         )
         return result.scalars().first()
 
+async def get_favorite_query_owned(guild_id: str, name: str, author_id: Optional[str]) -> Optional[FavoriteQuery]:
+    """Get a favorite query by name, restricted to an author unless author_id is None"""
+    conditions = [FavoriteQuery.guildId == guild_id, FavoriteQuery.name == name]
+    if author_id is not None:
+        conditions.append(FavoriteQuery.authorId == author_id)
+    
+    async with (await get_session()) as session:
+        result = await session.execute(select(FavoriteQuery).where(*conditions))
+        return result.scalars().first()
+
 async def delete_favorite_query(query_id: int) -> None:
     """Delete a favorite query by ID"""
     async with (await get_session()) as session:
@@ -212,15 +405,41 @@ async def delete_favorite_query(query_id: int) -> None:
             await session.commit()
 
 # File cache operations
-async def get_file_cache(hash_key: str) -> Optional[FileCache]:
-    """Get a file cache entry by hash"""
+async def get_existing_file_cache_hashes(hashes: List[str]) -> set:
+    """Get which of the given hashes have file cache entries, in one query per chunk"""
+    existing = set()
     async with (await get_session()) as session:
-        cache = await session.get(FileCache, hash_key)
-        if cache:
-            # Update accessed time
-            cache.accessedAt = datetime.utcnow()
-            await session.commit()
-        return cache
+        for i in range(0, len(hashes), _IN_CHUNK):
+            result = await session.execute(
+                select(FileCache.hash).where(FileCache.hash.in_(hashes[i:i + _IN_CHUNK]))
+            )
+            existing.update(result.scalars().all())
+    return existing
+
+async def touch_file_cache(hash_key: str) -> bool:
+    """
+    Mark a file cache entry as just accessed in one statement; returns whether it exists
+    
+    Each access also counts towards promoting the entry to a higher CacheTier.
+    """
+    count = FileCache.accessCount + 1
+    async with (await get_session()) as session:
+        result = await session.execute(
+            update(FileCache)
+            .where(FileCache.hash == hash_key)
+            .values(
+                accessedAt=datetime.utcnow(),
+                accessCount=count,
+                tier=case(
+                    (count >= HIGH_USE_ACCESSES, int(CacheTier.HIGH_USE)),
+                    (count >= 2, int(CacheTier.LOW_USE)),
+                    else_=int(CacheTier.NO_USE)
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        return result.rowcount > 0
 
 async def create_file_cache(hash_key: str, size: int) -> FileCache:
     """Create a new file cache entry"""
@@ -232,16 +451,28 @@ async def create_file_cache(hash_key: str, size: int) -> FileCache:
         )
         session.add(cache)
         await session.commit()
-        await session.refresh(cache)
         return cache
 
-async def remove_file_cache(hash_key: str) -> None:
-    """Remove a file cache entry from the database"""
+async def remove_file_cache(hash_key: str) -> bool:
+    """Remove a file cache entry in one DELETE without loading it first; returns whether it existed"""
     async with (await get_session()) as session:
-        cache = await session.get(FileCache, hash_key)
-        if cache:
-            await session.delete(cache)
-            await session.commit()
+        result = await session.execute(
+            delete(FileCache).where(FileCache.hash == hash_key)
+        )
+        await session.commit()
+        return result.rowcount > 0
+
+async def remove_file_caches(hashes: List[str]) -> None:
+    """Remove several file cache entries from the database in one statement per chunk"""
+    if not hashes:
+        return
+    
+    async with (await get_session()) as session:
+        for i in range(0, len(hashes), _IN_CHUNK):
+            await session.execute(
+                delete(FileCache).where(FileCache.hash.in_(hashes[i:i + _IN_CHUNK]))
+            )
+        await session.commit()
 
 async def get_total_cache_size() -> int:
     """Get the total size of all cached files in bytes"""
@@ -259,45 +490,73 @@ async def get_oldest_file_caches(limit: int = 10) -> List[FileCache]:
         )
         return list(result.scalars().all())
 
+async def get_oldest_file_caches_in_tier(tier: CacheTier, limit: int = 10) -> List[FileCache]:
+    """Get the oldest file cache entries of one tier by access time"""
+    async with (await get_session()) as session:
+        result = await session.execute(
+            select(FileCache)
+            .where(FileCache.tier == int(tier))
+            .order_by(FileCache.accessedAt)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
 # Key-value cache operations
+KV_MEMORY_MAX = 10_000  # Entries held in process in front of the table
+
+# key -> (value, monotonic expiry), least recently used first
+_kv_mem: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+def _kv_mem_put(key: str, value: str, ttl: float) -> None:
+    """Remember a key-value entry in memory, evicting the least recently used"""
+    _kv_mem[key] = (value, time.monotonic() + ttl)
+    _kv_mem.move_to_end(key)
+    if len(_kv_mem) > KV_MEMORY_MAX:
+        _kv_mem.popitem(last=False)
+
 async def get_key_value(key: str) -> Optional[str]:
     """Get a value from the key-value cache"""
+    entry = _kv_mem.get(key)
+    if entry:
+        if entry[1] > time.monotonic():
+            _kv_mem.move_to_end(key)
+            return entry[0]
+        del _kv_mem[key]
+    
     async with (await get_session()) as session:
         cache = await session.get(KeyValueCache, key)
         
+        # Expired rows are left for the periodic sweep so lookups stay read-only
         if not cache:
             return None
-            
-        # Check if expired
-        if cache.expiresAt < datetime.utcnow():
-            await session.delete(cache)
-            await session.commit()
+        
+        remaining = (cache.expiresAt - datetime.utcnow()).total_seconds()
+        if remaining <= 0:
             return None
-            
+        
+        _kv_mem_put(key, cache.value, remaining)
         return cache.value
 
 async def set_key_value(key: str, value: str, ttl: int) -> None:
     """Set a value in the key-value cache"""
+    expires_at = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=ttl)
+    
+    # Insert or overwrite in one statement
+    stmt = sqlite_insert(KeyValueCache).values(key=key, value=value, expiresAt=expires_at)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[KeyValueCache.key],
+        set_={
+            "value": stmt.excluded.value,
+            "expiresAt": stmt.excluded.expiresAt,
+            "updatedAt": datetime.utcnow()
+        }
+    )
+    
     async with (await get_session()) as session:
-        # Check if key exists
-        cache = await session.get(KeyValueCache, key)
-        
-        expires_at = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=ttl)
-        
-        if cache:
-            # Update existing
-            cache.value = value
-            cache.expiresAt = expires_at
-        else:
-            # Create new
-            cache = KeyValueCache(
-                key=key,
-                value=value,
-                expiresAt=expires_at
-            )
-            session.add(cache)
-            
+        await session.execute(stmt)
         await session.commit()
+    
+    _kv_mem_put(key, value, ttl)
 
 async def cleanup_expired_key_value_cache() -> int:
     """Remove all expired key-value cache entries"""
@@ -0,0 +1,114 @@
+# hertz/db/settings_cache.py
+"""In-memory TTL cache in front of get_guild_settings"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Tuple
+
+from .client import (
+    Setting,
+    create_default_settings,
+    get_guild_setting_column,
+    get_guild_settings,
+    get_guild_settings_many,
+    update_guild_setting,
+)
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_TTL = 60  # Seconds before a cached entry is re-read
+MAX_ENTRIES = 10_000
+
+# guild_id -> (expires_at, settings)
+_cache: Dict[str, Tuple[float, Setting]] = {}
+
+# guild_id -> load in progress, shared by every caller that misses meanwhile
+_inflight: Dict[str, asyncio.Future] = {}
+
+async def _load(guild_id: str) -> Setting:
+    """Read a guild's settings from the database into the cache"""
+    settings = await get_guild_settings(guild_id)
+    
+    # Drop the oldest entry when full
+    if len(_cache) >= MAX_ENTRIES:
+        _cache.pop(next(iter(_cache)), None)
+    
+    _cache[guild_id] = (time.monotonic() + SETTINGS_TTL, settings)
+    return settings
+
+async def get_guild_settings_cached(guild_id: str) -> Setting:
+    """Get settings for a guild, served from memory while fresh"""
+    entry = _cache.get(guild_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    
+    # Single flight: concurrent misses for a guild await the same query
+    future = _inflight.get(guild_id)
+    if future is None:
+        future = asyncio.ensure_future(_load(guild_id))
+        _inflight[guild_id] = future
+        future.add_done_callback(lambda _: _inflight.pop(guild_id, None))
+    
+    # Shielded so one cancelled command doesn't cancel the load for the others
+    return await asyncio.shield(future)
+
+async def get_guild_setting(guild_id: str, column) -> Any:
+    """Read one setting, from the cached row while fresh or as a single-column query otherwise"""
+    entry = _cache.get(guild_id)
+    if entry and entry[0] > time.monotonic():
+        return getattr(entry[1], column.key)
+    
+    return await get_guild_setting_column(guild_id, column)
+
+async def update_setting(guild_id: str, field: str, value: Any) -> None:
+    """Write a single guild setting through to the database and the cached copy"""
+    await update_guild_setting(guild_id, field, value)
+    
+    # A load that read the row before this write would cache the old value,
+    # so let it land first and then patch it
+    future = _inflight.get(guild_id)
+    if future is not None:
+        try:
+            await asyncio.shield(future)
+        except Exception:
+            pass
+    
+    entry = _cache.get(guild_id)
+    if entry:
+        setattr(entry[1], field, value)
+        entry[1].updatedAt = datetime.utcnow()
+
+async def warm(guild_ids: Iterable[str]) -> None:
+    """Preload settings for the given guilds, reading their existing rows in bulk"""
+    guild_ids = set(guild_ids)
+    
+    try:
+        rows = await get_guild_settings_many(list(guild_ids))
+    except Exception as e:
+        logger.error("Error bulk loading guild settings: %s", e)
+        rows = []
+    
+    expires = time.monotonic() + SETTINGS_TTL
+    count = 0
+    for settings in rows:
+        guild_ids.discard(settings.guildId)
+        if len(_cache) < MAX_ENTRIES:
+            _cache[settings.guildId] = (expires, settings)
+            count += 1
+    
+    # Guilds without a row yet get their defaults created in one batch
+    if guild_ids:
+        try:
+            created = await create_default_settings(list(guild_ids))
+            logger.info("Created default settings for %d guilds", len(created))
+        except Exception as e:
+            logger.error("Error creating default guild settings: %s", e)
+            created = []
+        
+        for settings in created:
+            if len(_cache) < MAX_ENTRIES:
+                _cache[settings.guildId] = (expires, settings)
+                count += 1
+    
+    logger.info("Warmed settings cache for %d guilds", count)
@@ -0,0 +1,86 @@
+# hertz/health_writer.py
+"""Heartbeat writer for the Docker health check"""
+import asyncio
+import atexit
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+HEALTH_FILE = '/data/health_status'
+HEALTH_INTERVAL = 10  # Seconds between heartbeats
+RETRY_INTERVAL = 1  # Short delay on error
+
+# Fixed width so every write fully overwrites the previous value
+# without truncating; readers strip the trailing padding
+_TS_FORMAT = b"%-16d"
+
+_handle: Optional[asyncio.TimerHandle] = None
+_fd: Optional[int] = None
+_stopped = False
+
+def _close_fd() -> None:
+    """Close the health file descriptor if it is open"""
+    global _fd
+    if _fd is not None:
+        os.close(_fd)
+        _fd = None
+
+def _open() -> int:
+    """Open the health file once and keep the descriptor for the process lifetime"""
+    global _fd
+    if _fd is None:
+        _fd = os.open(HEALTH_FILE, os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        atexit.register(_close_fd)
+    return _fd
+
+def tick() -> None:
+    """Write a single heartbeat as one positioned write to the already open file"""
+    os.pwrite(_open(), _TS_FORMAT % int(time.time()), 0)
+
+def _run() -> None:
+    """Write a heartbeat and schedule the next one"""
+    if _stopped:
+        return
+
+    try:
+        tick()
+        delay = HEALTH_INTERVAL
+    except Exception as e:
+        logger.error("Health check write failed: %s", e)
+        delay = RETRY_INTERVAL
+
+    _schedule(delay)
+
+def _schedule(delay: float) -> None:
+    """Schedule the next heartbeat on the running loop"""
+    global _handle
+    if _stopped:
+        return
+
+    loop = asyncio.get_event_loop()
+    _handle = loop.call_later(delay, _run)
+
+def start() -> None:
+    """Start the periodic heartbeat on the current event loop"""
+    global _stopped
+    if _handle is not None:
+        return
+
+    _stopped = False
+    logger.info("Health check writer started, writing to %s", HEALTH_FILE)
+    _schedule(0)
+
+def stop() -> None:
+    """Cancel the pending heartbeat and close the health file"""
+    global _handle, _stopped
+    _stopped = True
+    if _handle is not None:
+        _handle.cancel()
+        _handle = None
+
+    if _fd is not None:
+        atexit.unregister(_close_fd)
+        _close_fd()
@@ -7,12 +7,16 @@ from typing import List, Dict, Any, Tuple, Optional
 import disnake
 from disnake import ApplicationCommandInteraction
 
+from ..db.settings_cache import get_guild_settings_cached
 from ..services.get_songs import GetSongs
+from ..services.player import Status
 from ..utils.voice import get_member_voice_channel, get_most_popular_voice_channel
 from ..utils.embeds import create_playing_embed
 
 logger = logging.getLogger(__name__)
 
+SUGGESTION_DEADLINE = 2.5  # Seconds, leaving headroom in Discord's 3 second autocomplete window
+
 class AddQueryToQueue:
     """Service for adding queries to the queue"""
     
@@ -40,8 +44,7 @@ class AddQueryToQueue:
             voice_channel = get_most_popular_voice_channel(interaction.guild)
         
         # Get guild settings
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(str(guild_id))
+        settings = await get_guild_settings_cached(str(guild_id))
         
         # Get songs from query
         new_songs, extra_msg = await self.get_songs.get_songs(
@@ -58,12 +61,12 @@ class AddQueryToQueue:
             random.shuffle(new_songs)
         
         # Add songs to queue
-        for song in new_songs:
-            player.add({
-                **song,
-                "added_in_channel_id": interaction.channel.id,
-                "requested_by": interaction.author.id
-            }, immediate=add_to_front_of_queue)
+        player.extend(
+            new_songs,
+            immediate=add_to_front_of_queue,
+            channel_id=interaction.channel.id,
+            requested_by=interaction.author.id
+        )
         
         status_msg = ""
         embed = None
@@ -79,7 +82,7 @@ class AddQueryToQueue:
                 status_msg = "resuming playback"
             
             embed = create_playing_embed(player)
-        elif player.status == player.Status.IDLE:
+        elif player.status == Status.IDLE:
             # Player is idle, start playback
             await player.play()
         
@@ -104,25 +107,39 @@ class AddQueryToQueue:
         # Implement YouTube and Spotify suggestions
         from ..services.youtube import get_youtube_suggestions
         
-        suggestions = []
-        
-        # Get YouTube suggestions
-        try:
-            youtube_results = await get_youtube_suggestions(query)
-            for title in youtube_results[:10]:  # Limit to 10
-                suggestions.append({
-                    "name": f"YouTube: {title}",
-                    "value": title
-                })
-        except Exception as e:
-            logger.error(f"Error getting YouTube suggestions: {e}")
+        # Query both services at once so the slower one sets the latency, not the sum
+        youtube_task = asyncio.ensure_future(get_youtube_suggestions(query))
+        spotify_task = None
         
         # Get Spotify suggestions if credentials available
         if self.bot.config.SPOTIFY_CLIENT_ID and self.bot.config.SPOTIFY_CLIENT_SECRET:
             from ..services.spotify import get_spotify_suggestions
+            spotify_task = asyncio.ensure_future(get_spotify_suggestions(query, self.bot.config))
+        
+        tasks = [task for task in (youtube_task, spotify_task) if task is not None]
+        _, pending = await asyncio.wait(tasks, timeout=SUGGESTION_DEADLINE)
+        
+        # Past the deadline, answer with whatever finished
+        for task in pending:
+            task.cancel()
+            logger.warning("Suggestion lookup timed out, returning partial results")
+        
+        suggestions = []
+        
+        # Get YouTube suggestions
+        if youtube_task.done() and not youtube_task.cancelled():
+            try:
+                for title in youtube_task.result()[:10]:  # Limit to 10
+                    suggestions.append({
+                        "name": f"YouTube: {title}",
+                        "value": title
+                    })
+            except Exception as e:
+                logger.error(f"Error getting YouTube suggestions: {e}")
+        
+        if spotify_task is not None and spotify_task.done() and not spotify_task.cancelled():
             try:
-                spotify_results = await get_spotify_suggestions(query, self.bot.config)
-                for item in spotify_results[:10]:  # Limit to 10
+                for item in spotify_task.result()[:10]:  # Limit to 10
                     icon = "💿" if item["type"] == "album" else "🎵" 
                     suggestions.append({
                         "name": f"Spotify: {icon} {item['name']}",
@@ -1,11 +1,49 @@
 # hertz/services/api_queue.py
 import asyncio
 import logging
-from typing import Callable, TypeVar, Any, Awaitable
+import time
+from typing import Callable, TypeVar, Any, Awaitable, Optional
 
 logger = logging.getLogger(__name__)
 T = TypeVar('T')
 
+class TokenBucket:
+    """
+    Token bucket limiting how many requests may start per second
+    
+    Tokens refill continuously at `rate` per second up to `capacity`, so short
+    bursts are allowed while the sustained rate never exceeds `rate`.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket full
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to one second's worth)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
 class AsyncRequestQueue:
     """
     Queue for limiting concurrent API requests to avoid rate limits
@@ -15,16 +53,31 @@ class AsyncRequestQueue:
     for services like YouTube API which have strict rate limits.
     """
     
-    def __init__(self, concurrency: int = 4):
+    def __init__(self, concurrency: int = 4, rate: Optional[float] = None):
         """
         Initialize the queue with a concurrency limit
         
         Args:
             concurrency: Maximum number of concurrent requests
+            rate: Maximum requests started per second, or None for no rate limit
         """
-        self.semaphore = asyncio.Semaphore(concurrency)
+        # A counter under a condition instead of a Semaphore so the limit can change at runtime
+        self._slots = asyncio.Condition()
+        self.max_concurrency = concurrency
+        self.rate_limiter = TokenBucket(rate) if rate else None
         self.active_tasks = 0
     
+    async def set_concurrency(self, concurrency: int) -> None:
+        """
+        Change the concurrency limit without disturbing requests already running
+        
+        Lowering it lets in-flight requests finish and holds new ones back until
+        the active count drops below the new limit.
+        """
+        async with self._slots:
+            self.max_concurrency = max(1, concurrency)
+            self._slots.notify_all()
+    
     async def add(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
         """
         Add a function to the queue and execute it when a slot is available
@@ -37,14 +90,22 @@ class AsyncRequestQueue:
         Returns:
             The result of the function call
         """
-        async with self.semaphore:
+        async with self._slots:
+            await self._slots.wait_for(lambda: self.active_tasks < self.max_concurrency)
             self.active_tasks += 1
-            logger.debug(f"Starting API task ({self.active_tasks} active)")
-            try:
-                return await func(*args, **kwargs)
-            finally:
+        
+        logger.debug(f"Starting API task ({self.active_tasks} active)")
+        try:
+            # Take a token only once a slot is held, right before the call goes out
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            
+            return await func(*args, **kwargs)
+        finally:
+            async with self._slots:
                 self.active_tasks -= 1
-                logger.debug(f"Finished API task ({self.active_tasks} active)")
+                self._slots.notify(1)
+            logger.debug(f"Finished API task ({self.active_tasks} active)")
     
     async def add_batch(self, func: Callable[..., Awaitable[T]], args_list: list[tuple], **common_kwargs: Any) -> list[T]:
         """
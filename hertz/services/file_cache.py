@@ -1,28 +1,34 @@
 # hertz/services/file_cache.py
 import os
-import shutil
 import asyncio
 import logging
 import hashlib
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Awaitable, Callable
 
 from ..config import Config
 from ..db.client import (
-    get_file_cache, create_file_cache, remove_file_cache,
-    get_total_cache_size, get_oldest_file_caches
+    get_existing_file_cache_hashes, touch_file_cache, create_file_cache, remove_file_cache,
+    remove_file_caches, get_total_cache_size, get_oldest_file_caches, get_oldest_file_caches_in_tier,
+    get_recent_file_caches, CacheTier, FileCache
 )
 
 logger = logging.getLogger(__name__)
 
 class FileCacheProvider:
-    """Provides caching functionality for audio files"""
+    """
+    Provides caching functionality for audio files
+    
+    Files are staged in cache_dir/tmp and renamed into place, so cache_dir and
+    its tmp/ subdirectory must be on the same filesystem.
+    """
     
     def __init__(self, config: Config):
         self.config = config
         self.cache_dir = config.CACHE_DIR
         self.cache_limit_bytes = config.cache_limit_bytes
+        self.tiered_eviction = config.CACHE_EVICTION != "lru"
         self._eviction_lock = asyncio.Lock()
         
         # Ensure cache and temp directories exist
@@ -31,10 +37,8 @@ class FileCacheProvider:
     
     async def get_path_for(self, hash_key: str) -> Optional[str]:
         """Get path to cached file if it exists, otherwise return None"""
-        # Check if in database
-        cache_entry = await get_file_cache(hash_key)
-        
-        if not cache_entry:
+        # Check if in database, marking it as used
+        if not await touch_file_cache(hash_key):
             return None
         
         # Check if file exists
@@ -44,11 +48,17 @@ class FileCacheProvider:
             await remove_file_cache(hash_key)
             return None
         
-        logger.info(f"Using cached file {hash_key} (last accessed: {cache_entry.accessedAt})")
+        logger.info("Using cached file %s", hash_key)
         return file_path
     
-    async def cache_file(self, hash_key: str, file_path: str) -> str:
-        """Cache a file and add to database with proper locking"""
+    async def cache_file(self, hash_key: str, write: Callable[[str], Awaitable[None]]) -> str:
+        """
+        Cache a file and add to database with proper locking
+        
+        `write` is awaited with a temp path on the cache filesystem and should
+        stream the file's bytes straight into it; the finished file is then
+        renamed into place, so its bytes are only written once.
+        """
         # Create temp path for download
         tmp_dir = os.path.join(self.cache_dir, 'tmp')
         os.makedirs(tmp_dir, exist_ok=True)
@@ -59,27 +69,24 @@ class FileCacheProvider:
         # Skip if already cached
         if os.path.exists(final_path):
             # Update accessed time
-            await get_file_cache(hash_key)
+            await touch_file_cache(hash_key)
             return final_path
         
         try:
-            # Copy the file to temp location first if it's different
-            if os.path.abspath(file_path) != os.path.abspath(final_path):
-                shutil.copy2(file_path, tmp_path)
-                
-                # Get file size
-                file_size = os.path.getsize(tmp_path)
-                
-                # Move to final location
-                shutil.move(tmp_path, final_path)
-            else:
-                # File is already in the right place, just get size
-                file_size = os.path.getsize(file_path)
+            await write(tmp_path)
+            
+            # Get file size; disk I/O runs in a worker thread so it doesn't
+            # stall the event loop
+            file_size = await asyncio.to_thread(os.path.getsize, tmp_path)
+            
+            # Publish atomically; tmp/ lives inside cache_dir, so both paths
+            # are on the same filesystem and a rename is always enough
+            await asyncio.to_thread(os.rename, tmp_path, final_path)
             
             # Register in database
             await create_file_cache(hash_key, file_size)
             
-            logger.info(f"Successfully cached file {hash_key} ({file_size} bytes)")
+            logger.info("Successfully cached file %s (%s bytes)", hash_key, file_size)
             
             # Run eviction if needed
             await self.evict_if_needed()
@@ -87,15 +94,31 @@ class FileCacheProvider:
             return final_path
             
         except Exception as e:
-            logger.error(f"Error caching file {hash_key}: {e}")
+            logger.error("Error caching file %s: %s", hash_key, e)
             # Clean up tmp file if it exists
-            if 'tmp_path' in locals() and os.path.exists(tmp_path):
+            if os.path.exists(tmp_path):
                 try:
-                    os.remove(tmp_path)
+                    await asyncio.to_thread(os.remove, tmp_path)
                 except Exception as cleanup_error:
-                    logger.error(f"Error cleaning up tmp file: {cleanup_error}")
+                    logger.error("Error cleaning up tmp file: %s", cleanup_error)
             raise
     
+    async def get_stats(self) -> Dict[str, Any]:
+        """Collect cache statistics for display"""
+        total_size = await get_total_cache_size()
+        
+        # Count cached files, ignoring in-progress downloads
+        with os.scandir(self.cache_dir) as it:
+            file_count = sum(1 for entry in it if entry.is_file() and not entry.name.endswith('.tmp'))
+        
+        recent_files = await get_recent_file_caches(5)
+        
+        return {
+            "total_size": total_size,
+            "file_count": file_count,
+            "recent_files": recent_files
+        }
+    
     async def cleanup(self) -> None:
         """Clean up orphaned cache files and evict if over limit"""
         logger.info("Cleaning up file cache...")
@@ -107,35 +130,37 @@ class FileCacheProvider:
         """Remove files in cache directory that aren't in database"""
         logger.info("Checking for orphaned cache files...")
         
-        # Get list of all files in cache directory
-        cache_files = []
-        for file_name in os.listdir(self.cache_dir):
-            file_path = os.path.join(self.cache_dir, file_name)
-            if os.path.isfile(file_path) and not file_name.endswith('.tmp'):
-                cache_files.append((file_name, file_path))
-        
-        # Check each file against database
-        for file_hash, file_path in cache_files:
-            cache_entry = await get_file_cache(file_hash)
-            if not cache_entry:
-                logger.info(f"Removing orphaned file: {file_path}")
-                try:
-                    os.remove(file_path)
-                except Exception as e:
-                    logger.error(f"Error removing orphaned file: {e}")
+        # Get list of all files in cache directory; scandir entries carry their
+        # file type, so this is one directory read instead of a stat per file
+        with os.scandir(self.cache_dir) as it:
+            cache_files = [
+                (entry.name, entry.path) for entry in it
+                if entry.is_file() and not entry.name.endswith('.tmp')
+            ]
+        
+        # Look up every file on disk in one query and only visit the orphans
+        existing = await get_existing_file_cache_hashes([h for h, _ in cache_files])
+        orphans = [p for h, p in cache_files if h not in existing]
+        for file_path in orphans:
+            logger.info("Removing orphaned file: %s", file_path)
+            try:
+                await asyncio.to_thread(os.remove, file_path)
+            except Exception as e:
+                logger.error("Error removing orphaned file: %s", e)
         
         # Check for tmp directory files older than 24 hours
         tmp_dir = os.path.join(self.cache_dir, 'tmp')
-        for file_name in os.listdir(tmp_dir):
-            file_path = os.path.join(tmp_dir, file_name)
-            if os.path.isfile(file_path):
-                file_age = datetime.now().timestamp() - os.path.getmtime(file_path)
-                if file_age > 86400:  # 24 hours
-                    logger.info(f"Removing old temporary file: {file_path}")
-                    try:
-                        os.remove(file_path)
-                    except Exception as e:
-                        logger.error(f"Error removing temporary file: {e}")
+        now = datetime.now().timestamp()
+        with os.scandir(tmp_dir) as it:
+            for entry in it:
+                if entry.is_file():
+                    file_age = now - entry.stat().st_mtime
+                    if file_age > 86400:  # 24 hours
+                        logger.info("Removing old temporary file: %s", entry.path)
+                        try:
+                            await asyncio.to_thread(os.remove, entry.path)
+                        except Exception as e:
+                            logger.error("Error removing temporary file: %s", e)
     
     async def evict_if_needed(self) -> None:
         """Evict oldest files if cache size exceeds limit with proper locking"""
@@ -150,34 +175,72 @@ class FileCacheProvider:
             bytes_to_free = total_size - self.cache_limit_bytes
             bytes_freed = 0
             
-            logger.info(f"Cache size ({total_size} bytes) exceeds limit ({self.cache_limit_bytes} bytes)")
-            logger.info(f"Need to free {bytes_to_free} bytes")
+            logger.info("Cache size (%s bytes) exceeds limit (%s bytes)", total_size, self.cache_limit_bytes)
+            logger.info("Need to free %s bytes", bytes_to_free)
             
-            # Get oldest files first, in batches
+            # Oldest files first, in batches; with tiered eviction every file
+            # nobody replayed goes before any that were, and so on up the tiers
             batch_size = 10
-            while bytes_freed < bytes_to_free:
-                oldest_files = await get_oldest_file_caches(batch_size)
-                if not oldest_files:
-                    logger.warning("No more files to evict")
-                    break
-                
-                for file_cache in oldest_files:
-                    file_path = os.path.join(self.cache_dir, file_cache.hash)
-                    try:
-                        if os.path.exists(file_path):
-                            size = file_cache.bytes
-                            os.remove(file_path)
-                            await remove_file_cache(file_cache.hash)
-                            bytes_freed += size
-                            logger.info(f"Evicted file {file_cache.hash}, freed {size} bytes")
-                            
-                            if bytes_freed >= bytes_to_free:
-                                logger.info(f"Successfully freed {bytes_freed} bytes, enough to be under cache limit")
-                                break
-                        else:
-                            # File exists in DB but not on disk, clean up
-                            await remove_file_cache(file_cache.hash)
-                    except Exception as e:
-                        logger.error(f"Error evicting file {file_cache.hash}: {e}")
+            tiers = list(CacheTier) if self.tiered_eviction else [None]
+            for tier in tiers:
+                while bytes_freed < bytes_to_free:
+                    if tier is None:
+                        oldest_files = await get_oldest_file_caches(batch_size)
+                    else:
+                        oldest_files = await get_oldest_file_caches_in_tier(tier, batch_size)
+                    if not oldest_files:
+                        break
+                    
+                    freed = await self._evict_batch(oldest_files, bytes_to_free - bytes_freed)
+                    if freed is None:
+                        break
+                    bytes_freed += freed
             
-            logger.info(f"Cache eviction complete. Freed {bytes_freed} bytes.")
\ No newline at end of file
+            if bytes_freed >= bytes_to_free:
+                logger.info("Successfully freed %s bytes, enough to be under cache limit", bytes_freed)
+            else:
+                logger.warning("No more files to evict")
+            
+            logger.info("Cache eviction complete. Freed %s bytes.", bytes_freed)
+    
+    async def _evict_batch(self, files: List[FileCache], bytes_needed: int) -> Optional[int]:
+        """Evict just enough of a batch to free bytes_needed; returns bytes freed, or None if nothing could be removed"""
+        # Take just enough of the batch to cover what's left to free
+        to_delete = []
+        planned = 0
+        for file_cache in files:
+            to_delete.append(file_cache)
+            planned += file_cache.bytes
+            if planned >= bytes_needed:
+                break
+        
+        # Remove the files concurrently, then drop their rows together
+        results = await asyncio.gather(
+            *(asyncio.to_thread(os.remove, os.path.join(self.cache_dir, fc.hash)) for fc in to_delete),
+            return_exceptions=True
+        )
+        
+        removed = []
+        bytes_freed = 0
+        for file_cache, result in zip(to_delete, results):
+            if isinstance(result, FileNotFoundError):
+                # File exists in DB but not on disk, clean up
+                removed.append(file_cache.hash)
+            elif isinstance(result, Exception):
+                logger.error("Error evicting file %s: %s", file_cache.hash, result)
+            else:
+                removed.append(file_cache.hash)
+                bytes_freed += file_cache.bytes
+                logger.info("Evicted file %s, freed %s bytes", file_cache.hash, file_cache.bytes)
+        
+        if not removed:
+            logger.warning("Could not evict any files in this batch")
+            return None
+        
+        try:
+            await remove_file_caches(removed)
+        except Exception as e:
+            logger.error("Error removing evicted cache entries: %s", e)
+            return None
+        
+        return bytes_freed
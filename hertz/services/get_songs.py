@@ -14,13 +14,13 @@ logger = logging.getLogger(__name__)
 class GetSongs:
     """Service for retrieving songs from various sources"""
     
-    YOUTUBE_HOSTS = [
+    YOUTUBE_HOSTS = frozenset({
         'www.youtube.com',
         'youtu.be',
         'youtube.com',
         'music.youtube.com',
         'www.music.youtube.com',
-    ]
+    })
     
     def __init__(self, config: Config):
         self.config = config
@@ -40,13 +40,15 @@ class GetSongs:
         new_songs = []
         extra_msg = ""
         
-        # Check if it's a URL
+        # Check if it's a URL; without "://" urlparse can't find a host, so
+        # plain search terms skip parsing entirely
         is_url = False
-        try:
-            url_parts = urllib.parse.urlparse(query)
-            is_url = all([url_parts.scheme, url_parts.netloc])
-        except Exception:
-            is_url = False
+        if "://" in query:
+            try:
+                url_parts = urllib.parse.urlparse(query)
+                is_url = bool(url_parts.scheme and url_parts.netloc)
+            except Exception:
+                is_url = False
         
         if is_url:
             # Process URL
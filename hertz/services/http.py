@@ -0,0 +1,41 @@
+# hertz/services/http.py
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[aiohttp.ClientSession] = None
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared HTTP session, creating it on first use
+    
+    Reusing one session keeps the connection pool and DNS cache warm, so
+    repeated API calls skip the TCP and TLS handshakes.
+    """
+    global _session
+    
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+    
+    return _session
+
+@asynccontextmanager
+async def shared_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Drop-in for `async with aiohttp.ClientSession()` that leaves the shared session open"""
+    yield get_session()
+
+async def close_session() -> None:
+    """Close the shared HTTP session"""
+    global _session
+    
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("HTTP session closed")
+    
+    _session = None
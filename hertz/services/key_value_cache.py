@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, Optional, TypeVar, Callable, List
 
 from ..db.client import get_key_value, set_key_value
+from ..utils.hashing import fast_hash
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,18 @@ ONE_HOUR_IN_SECONDS = 60 * 60
 TEN_MINUTES_IN_SECONDS = 10 * 60
 ONE_MINUTE_IN_SECONDS = 60
 
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+
+def _make_key(func: Callable, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """Build a short cache key from a call, skipping JSON for plain scalar arguments"""
+    if all(type(a) in _SIMPLE_TYPES for a in args) and all(type(v) in _SIMPLE_TYPES for v in kwargs.values()):
+        # repr of scalars is stable and much cheaper than walking them with json
+        fingerprint = repr((args, sorted(kwargs.items())))
+    else:
+        fingerprint = json.dumps(args, sort_keys=True) + json.dumps(kwargs, sort_keys=True)
+    
+    return f"{func.__name__}:{fast_hash(fingerprint)}"
+
 class KeyValueCache:
     """
     Key-value cache service for storing API responses
@@ -79,9 +92,7 @@ class KeyValueCache:
         """
         # Generate cache key if not provided
         if not key:
-            args_str = json.dumps(args, sort_keys=True)
-            kwargs_str = json.dumps(kwargs, sort_keys=True)
-            key = f"{func.__name__}:{args_str}:{kwargs_str}"
+            key = _make_key(func, args, kwargs)
         
         # Try to get from cache
         cached = await self.get(key)
@@ -2,13 +2,11 @@
 import asyncio
 import logging
 import enum
-import os
 import hashlib
-import shutil
+import random
 import subprocess
-from typing import Optional, List, Dict, Any, Union, Callable
-import os
-import hashlib
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Union, Callable, Iterable
 
 import disnake
 from disnake.ext import commands
@@ -24,49 +22,44 @@ class MediaSource(enum.Enum):
     YOUTUBE = 0
     HLS = 1
 
-class Status(enum.Enum):
+class Status(enum.IntEnum):
     PLAYING = 0
     PAUSED = 1
     IDLE = 2
 
+# Slotted and frozen: queued songs live as long as the queue does, and slots
+# keep each one far smaller than the dicts they are built from
+@dataclass(frozen=True, slots=True, eq=False)
 class SongMetadata:
-    def __init__(
-        self, 
-        title: str, 
-        artist: str, 
-        url: str, 
-        length: int,
-        offset: int = 0,
-        playlist: Optional[Dict[str, str]] = None,
-        is_live: bool = False,
-        thumbnail_url: Optional[str] = None,
-        source: MediaSource = MediaSource.YOUTUBE
-    ):
-        self.title = title
-        self.artist = artist
-        self.url = url
-        self.length = length
-        self.offset = offset
-        self.playlist = playlist
-        self.is_live = is_live
-        self.thumbnail_url = thumbnail_url
-        self.source = source
+    title: str
+    artist: str
+    url: str
+    length: int
+    offset: int = 0
+    playlist: Optional[Dict[str, str]] = None
+    is_live: bool = False
+    thumbnail_url: Optional[str] = None
+    source: MediaSource = MediaSource.YOUTUBE
 
+@dataclass(frozen=True, slots=True, eq=False, kw_only=True)
 class QueuedSong(SongMetadata):
-    def __init__(
-        self, 
-        added_in_channel_id: str, 
-        requested_by: str, 
-        **kwargs
-    ):
-        super().__init__(**kwargs)
-        self.added_in_channel_id = added_in_channel_id
-        self.requested_by = requested_by
+    added_in_channel_id: str
+    requested_by: str
+
+@dataclass(frozen=True, slots=True)
+class PlayerSnapshot:
+    """Playback state captured once for building a single response"""
+    current: Optional[QueuedSong]
+    position: int
+    status: Status
+    volume: int
+    loop_current_song: bool
+    loop_current_queue: bool
 
 class Player:
     DEFAULT_VOLUME = 100
     
-    # Add this line to reference the Status enum from the class
+    # Kept for callers that still reach the enum through a player instance
     Status = Status
     
     def __init__(self, file_cache: FileCacheProvider, guild_id: str):
@@ -109,6 +102,17 @@ class Player:
             return self.queue[self.queue_position]
         return None
     
+    def snapshot(self) -> PlayerSnapshot:
+        """Capture the current song, position and playback state in one read"""
+        return PlayerSnapshot(
+            self.get_current(),
+            self.position_in_seconds,
+            self.status,
+            self.get_volume(),
+            self.loop_current_song,
+            self.loop_current_queue
+        )
+    
     def get_queue(self) -> List[QueuedSong]:
         """Get all songs in queue after the current one"""
         return self.queue[self.queue_position + 1:] if self.queue_position < len(self.queue) else []
@@ -125,9 +129,7 @@ class Player:
         """Add a song to the queue"""
         # Convert dict to QueuedSong if necessary
         if isinstance(song, dict):
-            if "source" in song and isinstance(song["source"], int):
-                song["source"] = MediaSource(song["source"])
-            song = QueuedSong(**song)
+            song = self._to_queued_song(song)
             
         if song.playlist or not immediate:
             # Add to end of queue
@@ -139,6 +141,48 @@ class Player:
             self.queue.insert(insert_at, song)
             logger.debug(f"[QUEUE] Added '{song.title}' to position {insert_at}")
     
+    def extend(
+        self,
+        songs: Iterable[Dict[str, Any]],
+        immediate: bool = False,
+        channel_id: Optional[int] = None,
+        requested_by: Optional[int] = None
+    ) -> None:
+        """
+        Add many songs at once, placed exactly as repeated add() calls would place them
+        
+        The song dicts are fresh results from GetSongs, so the requester fields
+        are written into them in place rather than copied into new dicts.
+        """
+        queued = []
+        for song in songs:
+            song["added_in_channel_id"] = channel_id
+            song["requested_by"] = requested_by
+            queued.append(self._to_queued_song(song))
+        
+        if immediate:
+            # Playlist entries still go to the end; the rest go next, and since each
+            # add() would insert at the same spot they end up in reverse order
+            front = [song for song in queued if not song.playlist]
+            back = [song for song in queued if song.playlist]
+        else:
+            front = []
+            back = queued
+        
+        self.queue.extend(back)
+        if front:
+            insert_at = self.queue_position + 1
+            self.queue[insert_at:insert_at] = front[::-1]
+        
+        logger.debug(f"[QUEUE] Added {len(queued)} songs ({len(front)} next, {len(back)} at end)")
+    
+    @staticmethod
+    def _to_queued_song(song: Dict[str, Any]) -> QueuedSong:
+        """Build a QueuedSong from a song dict"""
+        if "source" in song and isinstance(song["source"], int):
+            song["source"] = MediaSource(song["source"])
+        return QueuedSong(**song)
+    
     def clear(self) -> None:
         """Clear the queue but keep current song"""
         current = self.get_current()
@@ -153,22 +197,21 @@ class Player:
     
     def shuffle(self) -> None:
         """Shuffle the queue (excluding current song)"""
-        import random
         upcoming = self.get_queue()
         
         if not upcoming:
             logger.debug("[QUEUE] Shuffle requested but queue is empty")
             return
             
+        # Write the shuffled tail back in place rather than rebuilding the whole list
         random.shuffle(upcoming)
-        self.queue = self.queue[:self.queue_position + 1] + upcoming
+        self.queue[self.queue_position + 1:] = upcoming
         logger.info(f"[QUEUE] Shuffled {len(upcoming)} tracks")
     
     def remove_from_queue(self, index: int, amount: int = 1) -> None:
         """Remove songs from the queue"""
         actual_index = self.queue_position + index
         if 0 <= actual_index < len(self.queue):
-            removed = self.queue[actual_index:actual_index + amount]
             del self.queue[actual_index:actual_index + amount]
             logger.info(f"[QUEUE] Removed {amount} tracks starting at position {index}")
         else:
@@ -203,11 +246,17 @@ class Player:
             self.voice_client.source.volume = self.get_volume() / 100.0
         logger.info(f"[VOLUME] Set to {self.volume}%")
     
+    def toggle_loop_song(self) -> bool:
+        """Toggle looping the current song, turning queue looping off; returns the new state"""
+        self.loop_current_queue = False
+        self.loop_current_song = not self.loop_current_song
+        return self.loop_current_song
+    
     async def connect(self, channel: disnake.VoiceChannel) -> None:
         """Connect to a voice channel"""
         # Get default volume from settings
-        from ..db.client import get_guild_settings
-        settings = await get_guild_settings(self.guild_id)
+        from ..db.settings_cache import get_guild_settings_cached
+        settings = await get_guild_settings_cached(self.guild_id)
         self.default_volume = settings.defaultVolume
         
         # Connect to the voice channel
@@ -476,9 +525,9 @@ class Player:
             self.status = Status.IDLE
                 
             # Schedule disconnection if queue is empty
-            from ..db.client import get_guild_settings
+            from ..db.settings_cache import get_guild_settings_cached
             
-            settings = await get_guild_settings(self.guild_id)
+            settings = await get_guild_settings_cached(self.guild_id)
             disconnect_delay = settings.secondsToWaitAfterQueueEmpties
             
             if disconnect_delay > 0:
@@ -663,21 +712,10 @@ class Player:
     
     async def _cache_song(self, song: QueuedSong, url: str, cache_key: str) -> None:
         """Cache a song for future use"""
-        try:
-            # Create temp path for download
-            tmp_dir = os.path.join(self.file_cache.cache_dir, 'tmp')
-            os.makedirs(tmp_dir, exist_ok=True)
-            
-            tmp_path = os.path.join(tmp_dir, f"{cache_key}.tmp")
-            final_path = os.path.join(self.file_cache.cache_dir, cache_key)
-            
-            # Skip if already cached
-            if os.path.exists(final_path):
-                return
-            
+        async def download(tmp_path: str) -> None:
             logger.debug(f"[CACHE] Downloading '{song.title}' to cache")
             
-            # Use ffmpeg to download and convert
+            # Use ffmpeg to download and convert straight into the cache's temp file
             process = await asyncio.create_subprocess_exec(
                 'ffmpeg', 
                 '-y',                # Overwrite output files
@@ -693,34 +731,13 @@ class Player:
             _, stderr = await process.communicate()
             
             if process.returncode != 0:
-                logger.error(f"[ERROR] Cache download failed: {stderr.decode()}")
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-                return
-            
-            # Move temporary file to final location
-            if os.path.exists(tmp_path):
-                # Get file size for database
-                file_size = os.path.getsize(tmp_path)
-                
-                # Move to final location
-                shutil.move(tmp_path, final_path)
-                
-                # Register in database
-                await self.file_cache.cache_file(cache_key, final_path)
-                
-                logger.debug(f"[CACHE] Cached '{song.title}' ({file_size} bytes)")
-                
-                # Trigger eviction if we've gone over limit
-                await self.file_cache.evict_if_needed()
+                raise RuntimeError(f"Cache download failed: {stderr.decode()}")
+        
+        try:
+            await self.file_cache.cache_file(cache_key, download)
+            logger.debug(f"[CACHE] Cached '{song.title}'")
         except Exception as e:
             logger.error(f"[ERROR] Error caching song: {e}")
-            # Clean up tmp file if it exists
-            if 'tmp_path' in locals() and os.path.exists(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                except Exception as cleanup_error:
-                    logger.error(f"[ERROR] Error cleaning up tmp file: {cleanup_error}")
     
     def _start_position_tracking(self, initial_position: Optional[int] = None) -> None:
         """Start tracking playback position"""
@@ -749,10 +766,10 @@ class Player:
     
     def _register_voice_activity_listeners(self, channel: disnake.VoiceChannel) -> None:
         """Register listeners for voice activity to adjust volume"""
-        from ..db.client import get_guild_settings
+        from ..db.settings_cache import get_guild_settings_cached
         
         async def setup_voice_listener():
-            settings = await get_guild_settings(self.guild_id)
+            settings = await get_guild_settings_cached(self.guild_id)
             if not settings.turnDownVolumeWhenPeopleSpeak:
                 return
             
@@ -833,8 +850,8 @@ class Player:
                 self.status = Status.IDLE
                 
                 # Schedule auto-disconnect if enabled
-                from ..db.client import get_guild_settings
-                settings = await get_guild_settings(self.guild_id)
+                from ..db.settings_cache import get_guild_settings_cached
+                settings = await get_guild_settings_cached(self.guild_id)
                 disconnect_delay = settings.secondsToWaitAfterQueueEmpties
                 
                 if disconnect_delay > 0:
@@ -856,10 +873,10 @@ class Player:
         if not current:
             return
             
-        from ..db.client import get_guild_settings
+        from ..db.settings_cache import get_guild_settings_cached
         from ..utils.embeds import create_playing_embed
         
-        settings = await get_guild_settings(self.guild_id)
+        settings = await get_guild_settings_cached(self.guild_id)
         
         if settings.autoAnnounceNextSong and self.current_channel:
             logger.debug(f"[ANNOUNCE] Auto-announcing current track '{current.title}'")
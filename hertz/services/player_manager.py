@@ -18,11 +18,13 @@ class PlayerManager:
     
     def get_player(self, guild_id: int) -> Player:
         """Get or create a Player instance for a guild"""
-        if guild_id not in self.players:
+        # One lookup on the common path where the player already exists
+        player = self.players.get(guild_id)
+        if player is None:
             logger.debug(f"Creating new player for guild {guild_id}")
-            self.players[guild_id] = Player(self.file_cache, str(guild_id))
+            player = self.players[guild_id] = Player(self.file_cache, str(guild_id))
         
-        return self.players[guild_id]
+        return player
     
     def remove_player(self, guild_id: int) -> None:
         """Remove a Player instance for a guild"""
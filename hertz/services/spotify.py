@@ -6,11 +6,11 @@ import base64
 import time
 import random
 from typing import List, Dict, Any, Optional, Tuple, Union
-
-import aiohttp
 from urllib.parse import urlparse, parse_qs
 
 from ..config import Config
+from ..services.api_queue import TokenBucket
+from ..services.http import shared_session
 from ..services.key_value_cache import KeyValueCache
 from ..services.youtube import search_youtube
 
@@ -29,11 +29,13 @@ class SpotifyClient:
     API_BASE = "https://api.spotify.com/v1"
     TOKEN_URL = "https://accounts.spotify.com/api/token"
     
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, rate: float = 0):
         self.client_id = client_id
         self.client_secret = client_secret
         self.access_token = None
         self.token_expires = 0
+        # Spotify's own bucket, independent of the YouTube queue
+        self.rate_limiter = TokenBucket(rate) if rate > 0 else None
     
     async def get_token(self) -> str:
         """Get or refresh Spotify access token with retry logic"""
@@ -59,7 +61,7 @@ class SpotifyClient:
                 
                 data = {"grant_type": "client_credentials"}
                 
-                async with aiohttp.ClientSession() as session:
+                async with shared_session() as session:
                     async with session.post(
                         self.TOKEN_URL,
                         headers=headers,
@@ -106,7 +108,10 @@ class SpotifyClient:
                 headers = {"Authorization": f"Bearer {token}"}
                 url = f"{self.API_BASE}/{endpoint}"
                 
-                async with aiohttp.ClientSession() as session:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+                
+                async with shared_session() as session:
                     async with session.get(
                         url,
                         headers=headers,
@@ -157,7 +162,8 @@ def get_spotify_client(config: Config) -> Optional[SpotifyClient]:
     if _spotify_client is None:
         _spotify_client = SpotifyClient(
             config.SPOTIFY_CLIENT_ID,
-            config.SPOTIFY_CLIENT_SECRET
+            config.SPOTIFY_CLIENT_SECRET,
+            rate=config.SPOTIFY_REQUESTS_PER_SECOND
         )
     
     return _spotify_client
@@ -217,7 +223,9 @@ async def get_spotify_tracks(
             {"title": album_title, "source": f"spotify:album:{spotify_id}"},
             playlist_limit,
             should_split_chapters,
-            config.YOUTUBE_API_KEY
+            config.YOUTUBE_API_KEY,
+            concurrency=config.METADATA_CONCURRENCY,
+            timeout=config.METADATA_TIMEOUT
         )
     
     elif entity_type == "playlist":
@@ -231,7 +239,9 @@ async def get_spotify_tracks(
             {"title": playlist_title, "source": f"spotify:playlist:{spotify_id}"},
             playlist_limit,
             should_split_chapters,
-            config.YOUTUBE_API_KEY
+            config.YOUTUBE_API_KEY,
+            concurrency=config.METADATA_CONCURRENCY,
+            timeout=config.METADATA_TIMEOUT
         )
     
     elif entity_type == "artist":
@@ -245,7 +255,9 @@ async def get_spotify_tracks(
             {"title": f"{artist_name} Top Tracks", "source": f"spotify:artist:{spotify_id}"},
             playlist_limit,
             should_split_chapters,
-            config.YOUTUBE_API_KEY
+            config.YOUTUBE_API_KEY,
+            concurrency=config.METADATA_CONCURRENCY,
+            timeout=config.METADATA_TIMEOUT
         )
     
     else:
@@ -398,7 +410,9 @@ async def process_spotify_tracks(
     playlist: Dict[str, str],
     playlist_limit: int,
     should_split_chapters: bool,
-    youtube_api_key: str
+    youtube_api_key: str,
+    concurrency: int = 10,
+    timeout: float = 10
 ) -> Tuple[List[Dict[str, Any]], int, int]:
     """
     Process Spotify tracks into YouTube videos
@@ -409,6 +423,8 @@ async def process_spotify_tracks(
         playlist_limit: Maximum tracks to process
         should_split_chapters: Whether to split videos into chapters
         youtube_api_key: YouTube API key
+        concurrency: Maximum lookups in flight at once
+        timeout: Seconds before a single lookup is abandoned
         
     Returns:
         Tuple of (tracks, not_found_count, total_count)
@@ -420,31 +436,22 @@ async def process_spotify_tracks(
         # Take a random sample
         tracks = random.sample(tracks, playlist_limit)
     
-    # Convert each track - process in batches to avoid overwhelming system
-    BATCH_SIZE = 5
-    all_results = []
+    # Convert all tracks concurrently, bounded so lookups overlap without flooding the API
+    semaphore = asyncio.Semaphore(concurrency)
     
-    for i in range(0, len(tracks), BATCH_SIZE):
-        batch = tracks[i:i+BATCH_SIZE]
-        batch_tasks = []
-        
-        for track in batch:
-            batch_tasks.append(
+    async def convert(track: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await asyncio.wait_for(
                 convert_spotify_track_to_youtube(
                     track,
                     should_split_chapters,
                     youtube_api_key,
                     playlist
-                )
+                ),
+                timeout=timeout
             )
-        
-        # Wait for batch to complete
-        batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-        all_results.extend(batch_results)
-        
-        # Small delay between batches to prevent rate limiting
-        if i + BATCH_SIZE < len(tracks):
-            await asyncio.sleep(1)
+    
+    all_results = await asyncio.gather(*(convert(track) for track in tracks), return_exceptions=True)
     
     # Filter out failures
     converted_tracks = []
@@ -3,11 +3,13 @@ import asyncio
 import re
 import logging
 import json
+import time
+from collections import OrderedDict
+from itertools import islice
 from typing import List, Dict, Any, Optional, Tuple, Union
 
-import aiohttp
-
 from ..config import Config
+from ..services.http import shared_session
 from ..services.key_value_cache import KeyValueCache, ONE_HOUR_IN_SECONDS, TEN_MINUTES_IN_SECONDS, ONE_MINUTE_IN_SECONDS
 from ..services.api_queue import AsyncRequestQueue
 
@@ -15,8 +17,44 @@ logger = logging.getLogger(__name__)
 
 # Initialize cache
 key_value_cache = KeyValueCache()
-# Initialize API request queue
-request_queue = AsyncRequestQueue(concurrency=4)
+# Initialize API request queue, rate-limited to stay inside the YouTube Data API quota;
+# configure_request_queue swaps in the configured rate at startup
+YOUTUBE_REQUESTS_PER_SECOND = 10
+YOUTUBE_CONCURRENCY = 4
+request_queue = AsyncRequestQueue(concurrency=YOUTUBE_CONCURRENCY, rate=YOUTUBE_REQUESTS_PER_SECOND)
+
+def configure_request_queue(config: Config) -> None:
+    """Rebuild the YouTube request queue with the configured request rate"""
+    global request_queue
+    request_queue = AsyncRequestQueue(
+        concurrency=YOUTUBE_CONCURRENCY,
+        rate=config.YOUTUBE_REQUESTS_PER_SECOND or None
+    )
+
+# Concurrency halves on a 429 and grows back by one per quiet window
+RATE_LIMIT_RECOVERY = 30  # Seconds without a 429 before concurrency steps back up
+_last_rate_change = 0.0
+
+# In-memory suggestion cache in front of the key-value cache
+SUGGESTION_CACHE_SIZE = 1024
+SUGGESTION_PREFIX_WALK = 16  # How many shorter prefixes to check before fetching
+_suggestion_cache: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+_suggestion_inflight: Dict[str, asyncio.Future] = {}
+
+async def _track_rate_limit(status: int) -> None:
+    """Shrink the request queue on 429 responses and restore it once they stop"""
+    global _last_rate_change
+    
+    now = time.monotonic()
+    if status == 429:
+        _last_rate_change = now
+        if request_queue.max_concurrency > 1:
+            await request_queue.set_concurrency(request_queue.max_concurrency // 2)
+            logger.warning("YouTube API rate limited, concurrency lowered to %d", request_queue.max_concurrency)
+    elif request_queue.max_concurrency < YOUTUBE_CONCURRENCY and now - _last_rate_change > RATE_LIMIT_RECOVERY:
+        _last_rate_change = now
+        await request_queue.set_concurrency(request_queue.max_concurrency + 1)
+        logger.info("YouTube API concurrency raised to %d", request_queue.max_concurrency)
 
 async def search_youtube(
     query: str,
@@ -59,7 +97,7 @@ async def _search_youtube_impl(
     """Implementation of YouTube search with API call"""
     try:
         # Search for videos
-        async with aiohttp.ClientSession() as session:
+        async with shared_session() as session:
             params = {
                 'part': 'snippet',
                 'maxResults': 1,
@@ -72,6 +110,7 @@ async def _search_youtube_impl(
                 'https://www.googleapis.com/youtube/v3/search',
                 params=params
             ) as response:
+                await _track_rate_limit(response.status)
                 if response.status != 200:
                     error_text = await response.text()
                     logger.error(f"YouTube API error: {error_text}")
@@ -240,7 +279,7 @@ async def _get_youtube_playlist_impl(
     """Implementation of playlist retrieval"""
     try:
         # Get playlist details first
-        async with aiohttp.ClientSession() as session:
+        async with shared_session() as session:
             params = {
                 'part': 'snippet',
                 'id': playlist_id,
@@ -251,6 +290,7 @@ async def _get_youtube_playlist_impl(
                 'https://www.googleapis.com/youtube/v3/playlists',
                 params=params
             ) as response:
+                await _track_rate_limit(response.status)
                 if response.status != 200:
                     error_text = await response.text()
                     logger.error(f"YouTube API error: {error_text}")
@@ -284,6 +324,7 @@ async def _get_youtube_playlist_impl(
                     'https://www.googleapis.com/youtube/v3/playlistItems',
                     params=params
                 ) as response:
+                    await _track_rate_limit(response.status)
                     if response.status != 200:
                         error_text = await response.text()
                         logger.error(f"YouTube API error: {error_text}")
@@ -308,30 +349,24 @@ async def _get_youtube_playlist_impl(
                 'source': playlist_id
             }
             
-            # Process videos in batches of 50 (YouTube API limit)
+            # Fetch details for every video in bulk requests of 50 (YouTube API limit)
             results = []
             
-            # Process in batches to avoid API quota issues
-            for i in range(0, len(all_video_ids), 50):
-                batch = all_video_ids[i:i+50]
-                batch_videos = await get_videos_details(batch, api_key)
+            for video in await get_videos_details(all_video_ids, api_key):
+                # Process chapters if needed
+                if should_split_chapters:
+                    chapters = await process_video_chapters(
+                        video, 
+                        api_key, 
+                        playlist_obj
+                    )
+                    if chapters:
+                        results.extend(chapters)
+                        continue
                 
-                for video in batch_videos:
-                    if video:
-                        # Process chapters if needed
-                        if should_split_chapters:
-                            chapters = await process_video_chapters(
-                                video, 
-                                api_key, 
-                                playlist_obj
-                            )
-                            if chapters:
-                                results.extend(chapters)
-                                continue
-                        
-                        # Add as single video
-                        metadata = format_video_metadata(video, playlist_obj)
-                        results.append(metadata)
+                # Add as single video
+                metadata = format_video_metadata(video, playlist_obj)
+                results.append(metadata)
             
             # Cache the result - using short TTL as playlists change frequently
             await key_value_cache.set(
@@ -354,7 +389,7 @@ async def get_video_details(video_id: str, api_key: str) -> Optional[Dict[str, A
     if cached:
         return json.loads(cached)
     
-    async with aiohttp.ClientSession() as session:
+    async with shared_session() as session:
         params = {
             'part': 'snippet,contentDetails,statistics',
             'id': video_id,
@@ -365,6 +400,7 @@ async def get_video_details(video_id: str, api_key: str) -> Optional[Dict[str, A
             'https://www.googleapis.com/youtube/v3/videos',
             params=params
         ) as response:
+            await _track_rate_limit(response.status)
             if response.status != 200:
                 return None
             
@@ -385,43 +421,51 @@ async def get_video_details(video_id: str, api_key: str) -> Optional[Dict[str, A
         return result
 
 async def get_videos_details(video_ids: List[str], api_key: str) -> List[Dict[str, Any]]:
-    """Get detailed information about multiple YouTube videos"""
+    """
+    Get detailed information about multiple YouTube videos
+    
+    Duplicate IDs are fetched once, and results come back in the order of
+    video_ids with unavailable videos left out.
+    """
     if not video_ids:
         return []
     
-    # Batch the video IDs to avoid URL length limitations
+    # Batch the unique video IDs to avoid URL length limitations
     batch_size = 50  # YouTube API maximum
-    batches = [video_ids[i:i+batch_size] for i in range(0, len(video_ids), batch_size)]
+    unique_ids = iter(dict.fromkeys(video_ids))
     
-    results = []
-    for batch in batches:
+    by_id: Dict[str, Dict[str, Any]] = {}
+    while True:
+        batch = list(islice(unique_ids, batch_size))
+        if not batch:
+            break
+        
         # Create a cache key for this batch
         batch_key = f"youtube_videos_batch:{','.join(batch)}"
         cached = await key_value_cache.get(batch_key)
         
         if cached:
-            results.extend(json.loads(cached))
-            continue
-        
-        # Need to fetch this batch
-        async with aiohttp.ClientSession() as session:
-            params = {
-                'part': 'snippet,contentDetails,statistics',
-                'id': ','.join(batch),
-                'key': api_key
-            }
-            
-            async with session.get(
-                'https://www.googleapis.com/youtube/v3/videos',
-                params=params
-            ) as response:
-                if response.status != 200:
-                    continue
+            batch_results = json.loads(cached)
+        else:
+            # Need to fetch this batch
+            async with shared_session() as session:
+                params = {
+                    'part': 'snippet,contentDetails,statistics',
+                    'id': ','.join(batch),
+                    'key': api_key
+                }
                 
-                data = await response.json()
+                async with session.get(
+                    'https://www.googleapis.com/youtube/v3/videos',
+                    params=params
+                ) as response:
+                    await _track_rate_limit(response.status)
+                    if response.status != 200:
+                        continue
+                    
+                    data = await response.json()
             
             batch_results = data.get('items', [])
-            results.extend(batch_results)
             
             # Cache this batch
             await key_value_cache.set(
@@ -429,8 +473,11 @@ async def get_videos_details(video_ids: List[str], api_key: str) -> List[Dict[st
                 json.dumps(batch_results),
                 ONE_HOUR_IN_SECONDS
             )
+        
+        for video in batch_results:
+            by_id[video['id']] = video
     
-    return results
+    return [by_id[video_id] for video_id in video_ids if video_id in by_id]
 
 async def process_video_chapters(
     video: Dict[str, Any],
@@ -654,7 +701,7 @@ async def get_youtube_suggestions(query: str) -> List[str]:
         if cached:
             return json.loads(cached)
         
-        async with aiohttp.ClientSession() as session:
+        async with shared_session() as session:
             async with session.get(
                 "https://suggestqueries.google.com/complete/search",
                 params={
@@ -711,9 +758,87 @@ async def get_youtube_suggestions(query: str) -> List[str]:
         logger.error(f"Error getting YouTube suggestions: {e}")
         return []
 
+def _suggestion_cache_get(key: str) -> Optional[List[str]]:
+    """Get fresh suggestions for a normalized key, marking it recently used"""
+    entry = _suggestion_cache.get(key)
+    if entry is None:
+        return None
+    
+    if entry[0] <= time.monotonic():
+        del _suggestion_cache[key]
+        return None
+    
+    _suggestion_cache.move_to_end(key)
+    return entry[1]
+
+def _suggestion_cache_put(key: str, suggestions: List[str]) -> None:
+    """Store suggestions for a normalized key, evicting the least recently used"""
+    _suggestion_cache[key] = (time.monotonic() + TEN_MINUTES_IN_SECONDS, suggestions)
+    _suggestion_cache.move_to_end(key)
+    while len(_suggestion_cache) > SUGGESTION_CACHE_SIZE:
+        _suggestion_cache.popitem(last=False)
+
+def peek_youtube_suggestions(query: str) -> Optional[List[str]]:
+    """
+    Get suggestions from memory only, without making a request
+    
+    A keystroke whose shorter prefix already returned suggestions that all
+    extend the current text is answered from that entry.
+    """
+    key = query.strip().lower()
+    
+    suggestions = _suggestion_cache_get(key)
+    if suggestions is not None:
+        return suggestions
+    
+    # Walk back through shorter prefixes the user has already typed
+    for end in range(len(key) - 1, max(len(key) - SUGGESTION_PREFIX_WALK, 2) - 1, -1):
+        shorter = _suggestion_cache_get(key[:end])
+        if shorter and all(s.lower().startswith(key) for s in shorter):
+            return shorter
+    
+    return None
+
+async def get_youtube_suggestions_cached(query: str) -> List[str]:
+    """
+    Get YouTube suggestions through an in-memory LRU
+    
+    Concurrent lookups for the same text share one fetch.
+    """
+    suggestions = peek_youtube_suggestions(query)
+    if suggestions is not None:
+        return suggestions
+    
+    key = query.strip().lower()
+    inflight = _suggestion_inflight.get(key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+    
+    future = asyncio.get_running_loop().create_future()
+    _suggestion_inflight[key] = future
+    try:
+        suggestions = await get_youtube_suggestions(query)
+        
+        # Failures come back as an empty list, so don't pin those
+        if suggestions:
+            _suggestion_cache_put(key, suggestions)
+        
+        future.set_result(suggestions)
+        return suggestions
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Retrieve the exception so an unawaited future doesn't warn
+        future.exception()
+        raise
+    finally:
+        del _suggestion_inflight[key]
+
 async def test_youtube_api(api_key: str):
     """Test connection to YouTube API"""
-    async with aiohttp.ClientSession() as session:
+    async with shared_session() as session:
         params = {
             'part': 'snippet',
             'q': 'test',
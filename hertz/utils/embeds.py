@@ -1,12 +1,12 @@
 # hertz/utils/embeds.py
 import disnake
-from typing import Optional
+from typing import Optional, Dict, Any, Union
 import os
 import time
 import psutil
 import asyncio
 
-from ..services.player import Player
+from ..services.player import Player, PlayerSnapshot, Status
 from .time import pretty_time
 from .progress_bar import get_progress_bar
 
@@ -41,44 +41,43 @@ def get_queue_info(player: Player) -> str:
         return "-"
     return "1 track" if queue_size == 1 else f"{queue_size} tracks"
 
-def get_player_ui(player: Player) -> str:
+def get_player_ui(player: Union[Player, PlayerSnapshot]) -> str:
     """Generate a text-based UI for the player controls"""
-    song = player.get_current()
+    snap = player.snapshot() if isinstance(player, Player) else player
+    song = snap.current
     if not song:
         return ""
     
-    from ..services.player import Status
-    
-    position = player.get_position()
-    button = "⏹️" if player.status == Status.PLAYING else "▶️"
+    position = snap.position
+    button = "⏹️" if snap.status == Status.PLAYING else "▶️"
     progress_bar = get_progress_bar(10, position / song.length if song.length > 0 else 0)
     elapsed_time = "LIVE" if song.is_live else f"{pretty_time(position)}/{pretty_time(song.length)}"
-    loop = "🔂" if player.loop_current_song else "🔁" if player.loop_current_queue else ""
-    vol = f"{player.get_volume()}%"
+    loop = "🔂" if snap.loop_current_song else "🔁" if snap.loop_current_queue else ""
+    vol = f"{snap.volume}%"
     
     return f"{button} {progress_bar} `[{elapsed_time}]` 🔊 {vol} {loop}"
 
-def create_playing_embed(player: Player) -> disnake.Embed:
+def create_playing_embed(player: Union[Player, PlayerSnapshot]) -> disnake.Embed:
     """Create an embed for the currently playing song"""
-    current_song = player.get_current()
+    snap = player.snapshot() if isinstance(player, Player) else player
+    current_song = snap.current
     if not current_song:
         raise ValueError("No song is currently playing")
     
-    from ..services.player import Status
-    
     embed = disnake.Embed()
+    is_playing = snap.status == Status.PLAYING
     
     # Set a more vibrant color scheme
-    embed.color = disnake.Color.from_rgb(88, 101, 242) if player.status == Status.PLAYING else disnake.Color.from_rgb(237, 66, 69)
+    embed.color = disnake.Color.from_rgb(88, 101, 242) if is_playing else disnake.Color.from_rgb(237, 66, 69)
     
     # More audio-themed titles
-    embed.title = "🎧 Now Transmitting" if player.status == Status.PLAYING else "⏸️ Signal Paused"
+    embed.title = "🎧 Now Transmitting" if is_playing else "⏸️ Signal Paused"
     
     # Description with song details and UI
     embed.description = (
         f"**{get_song_title(current_song)}**\n"
         f"Requested by: <@{current_song.requested_by}>\n\n"
-        f"{get_player_ui(player)}"
+        f"{get_player_ui(snap)}"
     )
     
     # Set footer with source info
@@ -106,8 +105,6 @@ def create_queue_embed(player: Player, page: int = 1, page_size: int = 10) -> di
     page_start = (page - 1) * page_size
     page_end = min(page_start + page_size, queue_size)
     
-    from ..services.player import Status
-    
     embed = disnake.Embed()
     
     # Better title and color for queue
@@ -215,20 +212,17 @@ def create_health_embed(bot) -> disnake.Embed:
     return embed
 
 async def create_cache_embed(bot) -> disnake.Embed:
-    """Create an embed with cache statistics"""
-    from ..db.client import get_total_cache_size, get_recent_file_caches
-    
-    # Get cache data asynchronously (without asyncio.run)
-    total_size = await get_total_cache_size()
+    """Create an embed with freshly collected cache statistics"""
+    stats = await bot.file_cache.get_stats()
+    return format_cache_embed(bot, stats)
+
+def format_cache_embed(bot, stats: Dict[str, Any]) -> disnake.Embed:
+    """Create an embed from a cache statistics snapshot"""
+    total_size = stats["total_size"]
+    file_count = stats["file_count"]
+    recent_files = stats["recent_files"]
     cache_limit = bot.config.cache_limit_bytes
     
-    # Get count of cached files
-    cache_dir = bot.config.CACHE_DIR
-    file_count = len([f for f in os.listdir(cache_dir) if os.path.isfile(os.path.join(cache_dir, f)) and not f.endswith('.tmp')])
-    
-    # Get recent cached songs
-    recent_files = await get_recent_file_caches(5)
-    
     # Create embed with audio-themed styling
     embed = disnake.Embed(
         title="💽 Audio Cache Status",
@@ -49,7 +49,8 @@ def error_msg(error: str = None) -> str:
         "no songs found": "🔍 No matching signals found. Try different search terms.",
         "no tracks found": "🔍 No matching signals found. Try different search terms.",
         "a favorite with that name already exists": "⚠️ Frequency preset name already in use. Choose a different name.",
-        "you can only remove your own favorites": "🔒 Access denied: You can only delete your own frequency presets."
+        "you can only remove your own favorites": "🔒 Access denied: You can only delete your own frequency presets.",
+        "you have no favorite with that name": "🔒 No frequency preset of yours with that name. You can only delete your own."
     }
     
     # Check for partial matches first
@@ -0,0 +1,16 @@
+# hertz/utils/hashing.py
+"""Fast non-cryptographic hashing for cache keys"""
+import hashlib
+
+# xxh3 is several times faster than the hashlib digests; blake2b is the
+# quickest of those and stands in when xxhash isn't installed
+try:
+    import xxhash
+    
+    def fast_hash(data: str) -> str:
+        """Hash a string to a short hex digest for use as a cache key"""
+        return xxhash.xxh3_64_hexdigest(data.encode())
+except ImportError:
+    def fast_hash(data: str) -> str:
+        """Hash a string to a short hex digest for use as a cache key"""
+        return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
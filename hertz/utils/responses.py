@@ -11,7 +11,6 @@ class Responses:
     FAVORITE_CREATED = "💾 Frequency saved! Added to favorites"
     FAVORITE_REMOVED = "🗑️ Frequency deleted from favorites"
     TRACK_MOVED = "↕️ Track repositioned in queue"
-    VOLUME_SET = "🔊 Audio levels calibrated to {}%"
     
     # Status messages
     PAUSED = "⏸️ Track paused. Signal on standby."
@@ -23,7 +22,6 @@ class Responses:
     QUEUE_LOOPING = "🔄 Queue loop enabled"
     QUEUE_LOOP_STOPPED = "⏹️ Queue loop disabled"
     SHUFFLED = "🔀 Playlist frequencies randomized"
-    SEEKED = "⏩ Signal seeked to {}"
     REPLAYED = "🔄 Restarting current track"
     DISCONNECTED = "🔌 Connection terminated. Signal offline."
     STOPPED = "⏹️ Playback terminated. All channels cleared."
@@ -32,7 +30,6 @@ class Responses:
     CONFIG_UPDATED = "⚙️ Configuration updated: {}"
     
     # Playback messages for song advancement
-    NOW_PLAYING = "🎧 Now transmitting: {}"
     NEXT_TRACK = "⏭️ Next in queue: {}"
     
     @staticmethod
@@ -51,4 +48,19 @@ class Responses:
         skip_text = " and current track skipped" if skipped else ""
         extra_text = f" ({extra})" if extra else ""
         
-        return f"🎵 Signal received! **{first_title}** and {count} other tracks added{position_text} the queue{skip_text}{extra_text}"
\ No newline at end of file
+        return f"🎵 Signal received! **{first_title}** and {count} other tracks added{position_text} the queue{skip_text}{extra_text}"
+    
+    @staticmethod
+    def now_playing(title: str) -> str:
+        """Format message for the track now playing"""
+        return f"🎧 Now transmitting: {title}"
+    
+    @staticmethod
+    def volume_set(level: int) -> str:
+        """Format message for a volume change"""
+        return f"🔊 Audio levels calibrated to {level}%"
+    
+    @staticmethod
+    def seeked(position: str) -> str:
+        """Format message for a seek to the given position"""
+        return f"⏩ Signal seeked to {position}"
\ No newline at end of file
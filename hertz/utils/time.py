@@ -2,6 +2,9 @@
 import re
 from typing import Union
 
+_DURATION_PART_RE = re.compile(r'(\d+)([hms])')
+_DURATION_UNITS = {'h': 3600, 'm': 60, 's': 1}
+
 def pretty_time(seconds: int) -> str:
     """Format seconds as MM:SS or HH:MM:SS"""
     if seconds < 0:
@@ -60,20 +63,19 @@ def parse_duration(duration_str: str) -> int:
     if duration_str.isdigit():
         return int(duration_str)
     
-    # Use regex to extract hours, minutes, seconds
-    hours = re.search(r'(\d+)h', duration_str)
-    minutes = re.search(r'(\d+)m', duration_str)
-    seconds = re.search(r'(\d+)s', duration_str)
-    
+    # One pass over the string, counting only the first value given for each unit
+    seen = set()
     total_seconds = 0
     
-    if hours:
-        total_seconds += int(hours.group(1)) * 3600
-    
-    if minutes:
-        total_seconds += int(minutes.group(1)) * 60
+    for value, unit in _DURATION_PART_RE.findall(duration_str):
+        if unit not in seen:
+            seen.add(unit)
+            total_seconds += int(value) * _DURATION_UNITS[unit]
     
-    if seconds:
-        total_seconds += int(seconds.group(1))
-    
-    return total_seconds
\ No newline at end of file
+    return total_seconds
+
+def parse_any(time_str: str) -> int:
+    """Parse either a clock time ('1:30') or a duration ('90', '1m30s') into seconds"""
+    if ':' in time_str:
+        return parse_time(time_str)
+    return parse_duration(time_str)
@@ -1,6 +1,10 @@
 # hertz/utils/voice.py
+import functools
+from operator import itemgetter
 import disnake
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
+
+from .error_msg import error_msg
 
 def get_member_voice_channel(member: disnake.Member) -> Optional[disnake.VoiceChannel]:
     """Get the voice channel a member is in, or None if not in voice"""
@@ -17,22 +21,54 @@ def get_size_without_bots(channel: disnake.VoiceChannel) -> int:
     """Count non-bot members in a voice channel"""
     return sum(1 for member in channel.members if not member.bot)
 
+# guild_id -> {voice channel id: non-bot member count}, kept current by track_voice_state
+_voice_counts: Dict[int, Dict[int, int]] = {}
+
+def _count_voice_members(guild: disnake.Guild) -> Dict[int, int]:
+    """Count non-bot members in every voice channel of a guild and remember the result"""
+    counts = {channel.id: get_size_without_bots(channel) for channel in guild.voice_channels}
+    _voice_counts[guild.id] = counts
+    return counts
+
+def track_voice_state(member: disnake.Member, before: disnake.VoiceState, after: disnake.VoiceState) -> None:
+    """Apply a voice state change to the member counts of an already counted guild"""
+    if member.bot:
+        return
+    
+    counts = _voice_counts.get(member.guild.id)
+    if counts is None:
+        return  # Counted from scratch on first lookup
+    
+    before_channel, after_channel = before.channel, after.channel
+    if before_channel and after_channel and before_channel.id == after_channel.id:
+        return  # Mute/deafen changes don't move anyone
+    
+    if isinstance(before_channel, disnake.VoiceChannel):
+        counts[before_channel.id] = max(0, counts.get(before_channel.id, 0) - 1)
+    if isinstance(after_channel, disnake.VoiceChannel):
+        counts[after_channel.id] = counts.get(after_channel.id, 0) + 1
+
+def reset_voice_counts() -> None:
+    """Forget all member counts, e.g. after a reconnect may have missed events"""
+    _voice_counts.clear()
+
 def get_most_popular_voice_channel(guild: disnake.Guild) -> disnake.VoiceChannel:
     """Find the voice channel with the most non-bot users"""
-    voice_channels = [
-        channel for channel in guild.channels 
-        if isinstance(channel, disnake.VoiceChannel)
-    ]
+    counts = _voice_counts.get(guild.id) or _count_voice_members(guild)
     
-    if not voice_channels:
+    if not counts:
         raise ValueError("No voice channels found in guild")
     
-    # Find channel with most non-bot users
-    channels_with_size = [(channel, get_size_without_bots(channel)) for channel in voice_channels]
-    channels_with_size.sort(key=lambda x: x[1], reverse=True)
+    # Ties go to the first channel by position, so an all-empty guild gets its first channel
+    channel = guild.get_channel(max(counts.items(), key=itemgetter(1))[0])
+    if channel is None:
+        # Channel was deleted since counting started, count again
+        counts = _count_voice_members(guild)
+        if not counts:
+            raise ValueError("No voice channels found in guild")
+        channel = guild.get_channel(max(counts.items(), key=itemgetter(1))[0])
     
-    # Return the most popular channel, or the first one if they're all empty
-    return channels_with_size[0][0]
+    return channel
 
 def is_user_in_voice(guild: disnake.Guild, user_id: int) -> bool:
     """Check if a user is in any voice channel in the guild"""
@@ -42,4 +78,21 @@ def is_user_in_voice(guild: disnake.Guild, user_id: int) -> bool:
                 if member.id == user_id:
                     return True
     
-    return False
\ No newline at end of file
+    return False
+
+def require_voice(func):
+    """
+    Reject a command up front when the invoking member isn't in voice
+    
+    Runs before the handler so failing invocations skip both the defer
+    round-trip and player creation. functools.wraps keeps the handler's
+    signature visible for slash command option parsing.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, inter, *args, **kwargs):
+        if not inter.author.voice:
+            await inter.response.send_message(error_msg("you need to be in a voice channel"), ephemeral=True)
+            return
+        return await func(self, inter, *args, **kwargs)
+    
+    return wrapper
\ No newline at end of file